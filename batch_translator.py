@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from translation_cache import normalize_text
+
+# --- CONFIGURACIÓN ---
+BATCH_MAX_CHARS = 4500     # Límite de Google: 5000 caracteres por petición (dejamos margen)
+BATCH_MAX_LINES = 100      # Líneas máximas por petición
+BATCH_WORKERS = 4          # Peticiones simultáneas como máximo
+BATCH_SEPARATOR = "\n"     # El traductor conserva los saltos de línea, así se separan los resultados
+
+# -----------------------------------------------------------------------------
+# TRADUCCIÓN POR LOTES
+# -----------------------------------------------------------------------------
+class BatchTranslator:
+    # cached_translator: CachedTranslator (lookup/store + .translator).
+    # backend_factory: devuelve el traductor de cada hilo (de forma diferida). Los backends de
+    # translation_backends son seguros entre hilos y la fábrica devuelve siempre la misma instancia.
+    def __init__(self, cached_translator, backend_factory=None, max_chars=BATCH_MAX_CHARS,
+                 max_lines=BATCH_MAX_LINES, max_workers=BATCH_WORKERS):
+        self.cached = cached_translator
+        self.backend_factory = backend_factory
+        self.max_chars = max_chars; self.max_lines = max_lines
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="traduccion")
+        self.local = threading.local(); self.backend_generation = 0
+        self.lock = threading.Lock()
+        self.backend_requests = 0; self.lines_translated = 0; self.split_fallbacks = 0
+
+    def backend(self):
+        if self.backend_factory is None: return self.cached.translator
+        if getattr(self.local, 'generation', None) != self.backend_generation:
+            self.local.backend = self.backend_factory(); self.local.generation = self.backend_generation
+        return self.local.backend
+
+    def reset_backends(self):
+        # Cada hilo vuelve a pedir su traductor a la fábrica (p. ej. al cambiar de backend)
+        self.backend_generation += 1
+
+    def pack(self, texts):
+        # Empaquetado voraz en el menor número de lotes que respeten los límites
+        batches = []; current = []; current_len = 0
+        for text in texts:
+            extra = len(text) + (len(BATCH_SEPARATOR) if current else 0)
+            if current and (current_len + extra > self.max_chars or len(current) >= self.max_lines):
+                batches.append(current); current = []; current_len = 0; extra = len(text)
+            current.append(text); current_len += extra
+        if current: batches.append(current)
+        return batches
+
+    def translate_batch(self, texts):
+        with self.lock: self.backend_requests += 1
+        self.cached.count_backend_call()
+        translated = self.backend().translate(BATCH_SEPARATOR.join(texts))
+        parts = translated.split(BATCH_SEPARATOR) if translated else []
+        if len(parts) == len(texts): return [p.strip() for p in parts]
+        if len(texts) == 1: return [translated.strip() if translated else None]
+        # El traductor fusionó o partió líneas: se divide el lote en dos y se reintenta
+        with self.lock: self.split_fallbacks += 1
+        half = len(texts) // 2
+        return self.translate_batch(texts[:half]) + self.translate_batch(texts[half:])
+
+    def run_batch(self, texts, namespace, generation):
+        # namespace y generation son los del momento en que se pidió la traducción: un lote que
+        # espera en el pool mientras se cambia de backend no se envía al nuevo ni se guarda con su clave
+        if generation != self.backend_generation: return texts, [None] * len(texts)
+        try: translations = self.translate_batch(texts)
+        except Exception as e:
+            print(f"Error traduciendo lote de {len(texts)} líneas: {e}")
+            translations = [None] * len(texts)
+        if generation != self.backend_generation: return texts, translations
+        for text, translated in zip(texts, translations): self.cached.store(text, translated, namespace)
+        return texts, translations
+
+    def translate_lines(self, texts, on_result=None):
+        # Devuelve {texto: traducción}; on_result(texto, traducción) se llama en cuanto
+        # cada línea está disponible (primero las de la caché, luego lote a lote).
+        # La generación se lee antes que la clave (set_backend las cambia en el orden inverso)
+        generation = self.backend_generation; namespace = self.cached.namespace
+        results = {}; pending = []
+        for text in dict.fromkeys(normalize_text(t) for t in texts):
+            if not text: continue
+            cached = self.cached.lookup(text, namespace)
+            if cached is not None:
+                results[text] = cached
+                if on_result: on_result(text, cached)
+            else: pending.append(text)
+        futures = [self.executor.submit(self.run_batch, batch, namespace, generation) for batch in self.pack(pending)]
+        for future in as_completed(futures):
+            batch_texts, translations = future.result()
+            with self.lock: self.lines_translated += len(batch_texts)
+            for text, translated in zip(batch_texts, translations):
+                if translated is None: continue
+                results[text] = translated
+                if on_result: on_result(text, translated)
+        return results
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self.lock:
+            return {'backend_requests': self.backend_requests, 'lines_translated': self.lines_translated,
+                    'split_fallbacks': self.split_fallbacks}
@@ -0,0 +1,97 @@
+# Compara los backends de traducción contra el servidor falso local, sin red:
+#  1. Reutilización de conexiones: deep_translator (una conexión nueva por petición) frente a
+#     GoogleWebBackend (sesión persistente), con la misma concurrencia en ambos.
+#  2. Contrapresión: el servidor responde 429 por encima de --server-rate peticiones/s. Se lanza
+#     una ráfaga con deep_translator, con el backend limitado por debajo de ese ritmo y con el
+#     backend mal configurado por encima (se apoya en Retry-After y reintentos).
+#  3. Plazos: un servidor lento frente a un plazo corto por petición.
+#  4. Rendimiento del diccionario sin conexión.
+# Uso: python -m benchmarks.bench_backends [--requests 60] [--latency 0.05] [--server-rate 10]
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from deep_translator import GoogleTranslator
+
+from fake_translation_server import FakeTranslationServer, fake_translate
+from translation_backends import GoogleWebBackend, DictionaryBackend, DeadlineExceeded, BACKEND_MAX_CONCURRENCY
+
+BURST_THREADS = 16
+
+def synthetic_lines(count):
+    words = ["File", "Edit", "View", "Settings", "open the project", "save all changes", "the quick brown fox",
+             "jumps over the lazy dog", "Download", "Recent documents", "Help and feedback"]
+    return [f"{words[i % len(words)]} {i}" for i in range(count)]
+
+def deep_translator_call(server):
+    def call(text):
+        translator = GoogleTranslator(source='auto', target='es'); translator._base_url = server.url
+        return translator.translate(text)
+    return call
+
+def burst(call, lines, threads=BURST_THREADS):
+    # Devuelve (latencias de las que acabaron bien, errores por tipo, tiempo total)
+    latencies = []; errors = {}
+    def timed(text):
+        t0 = time.perf_counter()
+        try:
+            translated = call(text)
+            if translated != fake_translate(text, 'es'): raise ValueError("traducción incorrecta")
+            latencies.append(time.perf_counter() - t0)
+        except Exception as e: errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor: list(executor.map(timed, lines))
+    return np.array(latencies), errors, time.perf_counter() - start
+
+def report(name, server, latencies, errors, total):
+    stats = server.stats()
+    p50 = np.percentile(latencies, 50) * 1000 if len(latencies) else float('nan')
+    p99 = np.percentile(latencies, 99) * 1000 if len(latencies) else float('nan')
+    print(f"{name:<34} ok {len(latencies):>3}  errores {sum(errors.values()):>3}  p50 {p50:6.0f} ms  p99 {p99:6.0f} ms  "
+          f"total {total * 1000:6.0f} ms  conexiones {stats['connections']:>3}  429 {stats['throttled']:>3}"
+          + (f"  {errors}" if errors else ""))
+    server.reset_stats()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--server-rate', type=float, default=10.0)
+    args = parser.parse_args()
+    lines = synthetic_lines(args.requests)
+
+    print("1. Reutilización de conexiones (servidor sin límites)")
+    server = FakeTranslationServer(base_latency=args.latency).start()
+    report("deep_translator", server, *burst(deep_translator_call(server), lines, BACKEND_MAX_CONCURRENCY))
+    backend = GoogleWebBackend(url=server.url, rate=1000, burst=1000)
+    report("GoogleWebBackend (sesión)", server, *burst(backend.translate, lines, BACKEND_MAX_CONCURRENCY)); backend.close()
+    server.stop()
+
+    print(f"\n2. Contrapresión (el servidor limita a {args.server_rate:g} peticiones/s)")
+    server = FakeTranslationServer(base_latency=args.latency, rate_limit=args.server_rate).start()
+    report("deep_translator", server, *burst(deep_translator_call(server), lines))
+    time.sleep(1)
+    backend = GoogleWebBackend(url=server.url, rate=args.server_rate * 0.9, burst=int(args.server_rate * 0.9), deadline=60)
+    report("Backend limitado al 90%", server, *burst(backend.translate, lines)); backend.close()
+    time.sleep(1)
+    backend = GoogleWebBackend(url=server.url, rate=args.server_rate * 3, burst=int(args.server_rate * 3), deadline=60, retries=10)
+    report("Backend al 300% (429 + Retry-After)", server, *burst(backend.translate, lines))
+    print(f"   reintentos {backend.stats()['retries']}, esperas del limitador {backend.stats()['rate_limiter']}"); backend.close()
+    server.stop()
+
+    print("\n3. Plazos (servidor con 2 s de latencia, plazo de 0,5 s)")
+    server = FakeTranslationServer(base_latency=2.0).start()
+    backend = GoogleWebBackend(url=server.url, deadline=0.5, retries=0)
+    t0 = time.perf_counter()
+    try: backend.translate("Hello")
+    except DeadlineExceeded as e: print(f"   DeadlineExceeded ({e})")
+    except Exception as e: print(f"   {type(e).__name__} tras {(time.perf_counter() - t0) * 1000:.0f} ms ({e})")
+    else: print("   la petición terminó dentro del plazo (inesperado)")
+    print(f"   tiempo hasta devolver el control: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    backend.close(); server.stop()
+
+    print("\n4. Diccionario sin conexión")
+    dictionary = DictionaryBackend(path=None); text = "\n".join(synthetic_lines(1000))
+    t0 = time.perf_counter(); dictionary.translate(text); elapsed = time.perf_counter() - t0
+    print(f"   1000 líneas en {elapsed * 1000:.1f} ms ({1000 / elapsed:,.0f} líneas/s), {dictionary.stats()}")
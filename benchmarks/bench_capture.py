@@ -0,0 +1,59 @@
+# Compara la ruta de captura anterior (mss.mss() por pasada + np.array + cvtColor) con
+# CaptureService (grabber persistente, vista sin copia y búferes reutilizados).
+# Uso: python -m benchmarks.bench_capture [--frames 200] [--width 500 --height 300] [--synthetic]
+# --synthetic usa capturas generadas en memoria (sirve sin pantalla, mide solo la conversión).
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import cv2
+import mss
+from mss.screenshot import ScreenShot
+
+from capture import CaptureService
+
+class SyntheticGrabber:
+    # Imita a mss: cada grab copia los píxeles BGRA en un bytearray nuevo
+    def __init__(self, region):
+        self.pixels = np.random.default_rng(0).integers(0, 255, region['width'] * region['height'] * 4, dtype=np.uint8).tobytes()
+
+    def grab(self, region):
+        return ScreenShot(bytearray(self.pixels), region)
+
+    def close(self): pass
+
+def legacy_frame(region, synthetic):
+    if synthetic: sct_img = synthetic.grab(region)
+    else:
+        with mss.mss() as sct: sct_img = sct.grab(region)
+    img_np = np.array(sct_img); return cv2.cvtColor(img_np, cv2.COLOR_BGRA2GRAY)
+
+def measure(name, frame_fn, frames):
+    frame_fn()  # Calentamiento (primer grabber, primeros búferes)
+    start = time.perf_counter()
+    for _ in range(frames): frame_fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start(); peaks = []
+    for _ in range(min(frames, 50)):
+        base = tracemalloc.get_traced_memory()[0]; tracemalloc.reset_peak()
+        frame_fn(); peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    print(f"{name:<20} {frames / elapsed:8.1f} fps   {np.mean(peaks) / 1024:9.1f} KiB asignados por frame (pico)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--width', type=int, default=500)
+    parser.add_argument('--height', type=int, default=300)
+    parser.add_argument('--synthetic', action='store_true')
+    args = parser.parse_args()
+    region = {'top': 0, 'left': 0, 'width': args.width, 'height': args.height}
+    synthetic = SyntheticGrabber(region) if args.synthetic else None
+
+    service = CaptureService()
+    if synthetic: service.local.sct = synthetic; service.local.buffers = {}
+    measure("Ruta anterior", lambda: legacy_frame(region, synthetic), args.frames)
+    measure("CaptureService", lambda: service.grab_gray(region), args.frames)
+    measure("CaptureService x0.5", lambda: service.grab_gray(region, scale=0.5), args.frames)
+    print(f"Búferes reservados por CaptureService: {service.stats()['buffer_allocations']}")
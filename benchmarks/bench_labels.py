@@ -0,0 +1,92 @@
+# Mide el tiempo del hilo de interfaz por actualización de traducciones: la ruta anterior
+# (una QLabel con hoja de estilo por línea, borrada y recreada cuando cambia) frente a
+# TranslationLayer (pintado en un único paintEvent con cambios mínimos).
+# Cada actualización cambia el texto de un 5% de las líneas y mueve otro 5%.
+# Uso: python -m benchmarks.bench_labels [--updates 50] [--counts 10 100 500]
+# Funciona sin pantalla (QT_QPA_PLATFORM=offscreen por defecto).
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PyQt6.QtWidgets import QApplication, QWidget, QLabel
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPainter
+
+from translation_layer import TranslationLayer
+
+LEGACY_STYLE = """QLabel{background-color:rgb(40,40,40);color:#F0F0F0;border:1px solid rgba(255,255,255,60);border-radius:3px;padding:3px 5px;font-family:'Segoe UI',Arial,sans-serif;font-size:13px;font-weight:500}"""
+
+class Surface(QWidget):
+    def __init__(self):
+        super().__init__(); self.layer = None
+        self.setGeometry(0, 0, 1920, 1080); self.show()
+
+    def paintEvent(self, event):
+        if self.layer is not None:
+            painter = QPainter(self); self.layer.paint(painter, event.region()); painter.end()
+
+def make_lines(count, rng):
+    # Líneas en rejilla, como una página de texto: (texto, x, y, ancho)
+    columns = max(1, count // 40 + 1)
+    return {f"linea {i}": (f"Traducción de la línea número {i} " + "texto " * rng.randint(0, 6),
+                           20 + (i % columns) * (1880 // columns), 10 + (i // columns) * 26, 1880 // columns - 20)
+            for i in range(count)}
+
+def mutate(lines, rng):
+    lines = dict(lines); keys = list(lines); changed = max(1, len(keys) // 20)
+    for key in rng.sample(keys, changed):
+        text, x, y, w = lines[key]; lines[key] = (text + " (editado)", x, y, w)
+    for key in rng.sample(keys, changed):
+        text, x, y, w = lines[key]; lines[key] = (text, x, y + rng.choice((-16, 16)), w)
+    return lines
+
+def legacy_label(surface, text, x, y, w):
+    label = QLabel(text, surface); label.setAlignment(Qt.AlignmentFlag.AlignCenter); label.setWordWrap(True)
+    label.setStyleSheet(LEGACY_STYLE); label.setMaximumWidth(int(w)); label.adjustSize()
+    label.move(int(x), int(y)); label.show()
+    return label
+
+def legacy_apply(surface, labels, old, new):
+    # Antes las claves eran el texto original: cualquier cambio era quitar y volver a crear
+    for key in list(labels):
+        if key not in new or new[key] != old.get(key): labels.pop(key).deleteLater()
+    for key, (text, x, y, w) in new.items():
+        if key not in labels: labels[key] = legacy_label(surface, text, x, y, w)
+
+def layer_apply(layer, labels, old, new):
+    for key in old.keys() - new.keys(): layer.remove_item(key)
+    for key, (text, x, y, w) in new.items():
+        if old.get(key) != new[key]: layer.set_item(key, text, x, y, w)
+
+def measure(app, count, updates, legacy):
+    rng = random.Random(count); surface = Surface(); labels = {}
+    if not legacy: surface.layer = TranslationLayer(surface)
+    apply = (lambda old, new: legacy_apply(surface, labels, old, new)) if legacy else (lambda old, new: layer_apply(surface.layer, labels, old, new))
+    current = make_lines(count, rng); apply({}, current); surface.repaint(); app.processEvents()
+    times = []
+    for _ in range(updates):
+        new = mutate(current, rng)
+        start = time.perf_counter()
+        apply(current, new)
+        # deleteLater, cambios de geometría y repintado de las zonas invalidadas
+        app.processEvents(); app.processEvents()
+        times.append(time.perf_counter() - start)
+        current = new
+    for label in labels.values(): label.deleteLater()
+    surface.close(); surface.deleteLater(); app.processEvents()
+    return np.array(times) * 1000
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--updates', type=int, default=50)
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 500])
+    args = parser.parse_args()
+    app = QApplication([])
+    print(f"{'Etiquetas':>9}  {'QLabel (ms) media / p95':>26}  {'TranslationLayer (ms) media / p95':>34}")
+    for count in args.counts:
+        legacy = measure(app, count, args.updates, True); layer = measure(app, count, args.updates, False)
+        print(f"{count:>9}  {legacy.mean():>15.2f} / {np.percentile(legacy, 95):>7.2f}  {layer.mean():>23.2f} / {np.percentile(layer, 95):>7.2f}")
@@ -0,0 +1,79 @@
+# Compara la detección de idioma anterior (langdetect.detect en cada línea de cada pasada,
+# sin semilla) con LanguageIdentifier (memoria + vía rápida + langdetect con semilla).
+# Simula refrescos de una pantalla con textos de interfaz y frases en inglés y español.
+# Uso: python -m benchmarks.bench_language_id [--passes 20] [--lines 150] [--churn 0.1]
+import argparse
+import random
+import time
+
+import numpy as np
+
+from language_id import LanguageIdentifier
+
+EN_UI = ["File", "Edit", "View", "Help", "Settings", "Open recent", "Save as", "Close window", "Sign in", "Download",
+         "Cancel", "Search", "Next", "Back", "Delete", "Select all", "Show more", "Account", "Tools", "Options",
+         "Read more", "Continue", "Undo", "Learn more", "Loading..."]
+ES_UI = ["Archivo", "Editar", "Ver", "Ayuda", "Configuración", "Abrir recientes", "Guardar como", "Cerrar ventana",
+         "Iniciar sesión", "Descargar", "Cancelar", "Buscar", "Siguiente", "Anterior", "Eliminar", "Seleccionar todo",
+         "Mostrar más", "Cuenta", "Herramientas", "Opciones", "Leer más", "Continuar", "Deshacer", "Cargando..."]
+# Frases sin palabras del vocabulario de la vía rápida: las resuelve langdetect
+EN_RARE = ["Quarterly revenue projections", "Brightness", "Keyboard shortcuts", "Wireless printer troubleshooting",
+           "Battery health", "Privacy dashboard", "Bluetooth devices nearby", "Weekly summary"]
+ES_RARE = ["Proyecciones trimestrales", "Brillo", "Atajos rápidos", "Solución problemas impresora inalámbrica",
+           "Salud batería", "Panel privacidad", "Dispositivos cercanos", "Resumen semanal"]
+EN_WORDS = "system update network memory window user data server report project device screen version error".split()
+ES_WORDS = "sistema actualización red memoria ventana usuario datos servidor informe proyecto equipo pantalla versión error".split()
+
+def sentence(rng, lang):
+    if lang == 'en':
+        return f"The {rng.choice(EN_WORDS)} {rng.choice(['is', 'was', 'will be'])} {rng.choice(['ready', 'updated', 'saved', 'available'])} for the {rng.choice(EN_WORDS)} {rng.randint(1, 99)}"
+    return f"El {rng.choice(ES_WORDS)} {rng.choice(['está', 'fue', 'será'])} {rng.choice(['listo', 'guardado', 'disponible'])} para la {rng.choice(ES_WORDS)} {rng.randint(1, 99)}"
+
+def make_line(rng):
+    kind = rng.random()
+    if kind < 0.05: return f"{rng.randint(1, 9999)}", None
+    lang = rng.choice(('en', 'es'))
+    if kind < 0.45: return rng.choice(EN_UI if lang == 'en' else ES_UI), lang
+    if kind < 0.6: return rng.choice(EN_RARE if lang == 'en' else ES_RARE), lang
+    return sentence(rng, lang), lang
+
+def make_passes(passes, lines, churn, rng):
+    screen = [make_line(rng) for _ in range(lines)]; result = []
+    for _ in range(passes):
+        result.append(list(screen))
+        for i in rng.sample(range(lines), int(lines * churn)): screen[i] = make_line(rng)
+    return result
+
+def legacy_pass(lines):
+    from langdetect import detect, LangDetectException
+    out = {}
+    for text, _ in lines:
+        try: out[text] = detect(text)
+        except (LangDetectException, TypeError): out[text] = None
+    return out
+
+def run(name, passes, fn):
+    times = []; correct = 0; total = 0; seen = {}; unstable = set()
+    for lines in passes:
+        start = time.perf_counter(); out = fn(lines); times.append((time.perf_counter() - start) * 1000)
+        for text, lang in lines:
+            # Solo importa la decisión de traducir: None y 'es' no se traducen
+            decision = out.get(text) not in (None, 'es'); expected = lang not in (None, 'es')
+            correct += decision == expected; total += 1
+            if seen.setdefault(text, out.get(text)) != out.get(text): unstable.add(text)
+    times = np.array(times)
+    print(f"{name:<22} {times[0]:8.1f} ms 1ª pasada  {np.median(times[1:]):8.2f} ms/pasada (mediana)  "
+          f"aciertos {100 * correct / total:5.1f}%  textos inestables {len(unstable)}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--passes', type=int, default=20)
+    parser.add_argument('--lines', type=int, default=150)
+    parser.add_argument('--churn', type=float, default=0.1)
+    args = parser.parse_args()
+    passes = make_passes(args.passes, args.lines, args.churn, random.Random(0))
+    legacy_pass([("warm up", 'en')])  # Carga de perfiles fuera de la medida
+    identifier = LanguageIdentifier(('en', 'es')); identifier.load()
+    run("langdetect por línea", passes, legacy_pass)
+    run("LanguageIdentifier", passes, lambda lines: identifier.detect_batch([text for text, _ in lines]))
+    print(f"Estadísticas: {identifier.stats()}")
@@ -0,0 +1,77 @@
+# Compara la agrupación anterior por líneas (cada fragmento con el anterior, tolerancias
+# fijas en píxeles) con layout_engine.group_paragraphs sobre cajas sintéticas: páginas en
+# varias columnas con párrafos envueltos, un menú lateral y ruido de baja confianza.
+# Uso: python -m benchmarks.bench_layout [--fragments 200 1000 5000] [--repeat 20]
+import argparse
+import random
+import time
+
+import numpy as np
+
+from layout_engine import group_paragraphs
+
+LINE_TOLERANCE = 10
+HORIZONTAL_TOLERANCE_PIXELS = 30
+
+def legacy_group(fragments):
+    # Copia de MainApp.group_text_fragments_by_line antes del motor de disposición
+    if not fragments: return []
+    fragments = [f for f in fragments if f[2] > 0.3]; fragments.sort(key=lambda f: (f[0][0][1], f[0][0][0]))
+    if not fragments: return []
+    lines = []; current_line = [fragments[0]]
+    for i in range(1, len(fragments)):
+        prev_box = current_line[-1][0]; curr_box = fragments[i][0]
+        y_diff = abs(curr_box[0][1] - prev_box[0][1]); x_gap = curr_box[0][0] - prev_box[1][0]
+        if y_diff < LINE_TOLERANCE and 0 < x_gap < HORIZONTAL_TOLERANCE_PIXELS: current_line.append(fragments[i])
+        else: lines.append(current_line); current_line = [fragments[i]]
+    lines.append(current_line)
+    processed_lines = []
+    for line_fragments in lines:
+        full_text = " ".join([f[1] for f in line_fragments])
+        if len(full_text.strip()) < 2 or full_text.strip().isdigit(): continue
+        min_x = line_fragments[0][0][0][0]; max_x = line_fragments[-1][0][1][0]
+        min_y = min(f[0][0][1] for f in line_fragments); max_y = max(f[0][2][1] for f in line_fragments)
+        processed_lines.append({'bbox': [[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y]], 'text': full_text})
+    return processed_lines
+
+def box(x, y, w, h):
+    return [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+
+def synthetic_page(target_fragments, rng):
+    # Devuelve (fragmentos, párrafos reales). EasyOCR entrega trozos de 1-4 palabras por fragmento.
+    fragments = []; paragraphs = 0
+    for i in range(8):  # Menú lateral: líneas cortas alineadas que no deben unirse
+        fragments.append((box(10, 40 + i * 30, rng.randint(40, 90), 16), f"Menú {i}", 0.9))
+    columns = 3; column_width = 560; page_top = 30
+    while len(fragments) < target_fragments:
+        for column in range(columns):
+            size = rng.choice((14, 16, 18)); x_left = 200 + column * (column_width + 60)
+            y = page_top + rng.randint(0, 4); paragraphs += 1
+            for line in range(rng.randint(2, 6)):
+                x = x_left + rng.randint(-2, 2); line_end = x_left + column_width - rng.randint(0, 120 if line else 30)
+                while x < line_end:
+                    w = rng.randint(3, 14) * size // 2
+                    fragments.append((box(x, y + rng.randint(-2, 2), w, size), " ".join(["palabra"] * rng.randint(1, 4)), rng.uniform(0.5, 1.0)))
+                    x += w + rng.randint(size // 3, size)
+                y += int(size * 1.4)
+            if rng.random() < 0.3: fragments.append((box(x_left, y + 4, 30, 10), "x", 0.1))  # ruido
+        page_top += 6 * 18 * 2
+    return fragments, paragraphs
+
+def measure(fn, fragments, repeat):
+    fn(list(fragments)); times = []
+    for _ in range(repeat):
+        start = time.perf_counter(); units = fn(list(fragments)); times.append(time.perf_counter() - start)
+    return np.array(times) * 1000, units
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fragments', type=int, nargs='+', default=[200, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    print(f"{'Fragmentos':>10} {'Párrafos':>9}  {'Anterior: ms / unidades':>24}  {'Disposición: ms / unidades':>27}")
+    for count in args.fragments:
+        fragments, paragraphs = synthetic_page(count, random.Random(count))
+        legacy_ms, legacy_units = measure(legacy_group, fragments, args.repeat)
+        layout_ms, layout_units = measure(group_paragraphs, fragments, args.repeat)
+        print(f"{len(fragments):>10} {paragraphs + 8:>9}  {np.median(legacy_ms):>13.2f} / {len(legacy_units):>6}  {np.median(layout_ms):>16.2f} / {len(layout_units):>6}")
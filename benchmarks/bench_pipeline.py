@@ -0,0 +1,220 @@
+# Reproduce un corpus de capturas a través del pipeline real (captura -> OCR -> disposición
+# -> idioma -> traducción) sin interfaz ni red, con un traductor determinista, y escribe un
+# informe JSON: percentiles por etapa, rendimiento, RSS máximo y llamadas al traductor.
+# Corpus: carpeta con capturas sueltas (*.png, modo pantalla completa) y subcarpetas con
+# secuencias de capturas ordenadas por nombre (modos rectángulo periódico y puntero).
+# Sin corpus se genera uno sintético determinista con Qt.
+# Uso: python -m benchmarks.bench_pipeline [--corpus carpeta] [--output informe.json]
+#      [--modes fullscreen periodic pointer] [--translator-latency 0.05] [--fp32]
+#      [--trace carpeta]  (una traza Chrome por modo: abrir en chrome://tracing o Perfetto)
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+
+from pipeline import TranslationPipeline, HeadlessLabels
+from tracing import Tracer
+from translation_cache import TranslationCache
+from language_id import LanguageIdentifier
+from tiled_ocr import TiledOcrEngine, TILE_WORKERS
+from ocr_reader import OCR_LANGUAGES, OCR_QUANTIZE, create_reader, describe_reader
+from fake_translation_server import fake_translate
+
+POINTER_WIDTH = 500
+POINTER_HEIGHT = 300
+PERIODIC_REGION = {'left': 460, 'top': 240, 'width': 1000, 'height': 600}
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# -----------------------------------------------------------------------------
+# SUSTITUTOS DE LA PANTALLA, EL TRADUCTOR Y EL HILO DE OCR
+# -----------------------------------------------------------------------------
+class ReplayCapture:
+    # Misma interfaz que CaptureService, pero las capturas salen de la imagen actual del corpus
+    def __init__(self):
+        self.frame = None; self.frames = 0
+
+    def set_frame(self, img_gray):
+        self.frame = img_gray
+
+    @property
+    def monitors(self):
+        h, w = self.frame.shape[:2]
+        monitor = {'left': 0, 'top': 0, 'width': w, 'height': h}
+        return [monitor, monitor]
+
+    def grab_gray(self, region, scale=1.0, reuse=True):
+        h, w = self.frame.shape[:2]
+        x0 = min(max(0, region['left']), w); y0 = min(max(0, region['top']), h)
+        crop = np.zeros((region['height'], region['width']), dtype=np.uint8)
+        view = self.frame[y0:y0 + region['height'], x0:x0 + region['width']]
+        crop[:view.shape[0], :view.shape[1]] = view
+        self.frames += 1
+        return crop
+
+    def stats(self):
+        return {'frames': self.frames, 'buffer_allocations': 0}
+
+class StubTranslator:
+    # Traductor determinista con latencia fija por petición; cuenta peticiones y caracteres
+    def __init__(self, latency=0.0):
+        self.latency = latency; self.lock = threading.Lock()
+        self.calls = 0; self.chars = 0
+
+    def translate(self, text):
+        with self.lock: self.calls += 1; self.chars += len(text)
+        if self.latency: time.sleep(self.latency)
+        return fake_translate(text, 'es')
+
+    def stats(self):
+        with self.lock: return {'calls': self.calls, 'chars': self.chars}
+
+class ReplayJob:
+    # Trabajo síncrono: nunca se cancela y emite directamente
+    def __init__(self, reader, kind):
+        self.reader = reader; self.kind = kind
+
+    def check(self): pass
+
+    def emit(self, signal, *args):
+        signal.emit(*args)
+
+# -----------------------------------------------------------------------------
+# CORPUS
+# -----------------------------------------------------------------------------
+PARAGRAPHS = [
+    "The quarterly report is ready for review. Please check the updated figures before the meeting on Friday.",
+    "Wireless network settings have changed. Restart the application to apply the new configuration.",
+    "El informe trimestral está listo para su revisión. Revise las cifras actualizadas antes de la reunión.",
+    "Sign in to continue to your account. Your session has expired after thirty minutes of inactivity.",
+    "Download the latest version to get security fixes, performance improvements and new features.",
+    "Guardar los cambios antes de salir. Los documentos abiertos se cerrarán automáticamente.",
+]
+
+def synthetic_corpus(frames=8):
+    # Un escritorio 1920x1080 con menú, tres columnas de párrafos y una secuencia que alterna
+    # capturas idénticas con desplazamientos de 40 px (como al hacer scroll)
+    from PyQt6.QtGui import QGuiApplication, QImage, QPainter, QColor, QFont
+    from PyQt6.QtCore import QRect, Qt
+    app = QGuiApplication.instance() or QGuiApplication([])
+    page = QImage(1920, 1080 + frames * 40, QImage.Format.Format_Grayscale8); page.fill(QColor(245, 245, 245))
+    painter = QPainter(page); font = QFont(); font.setFamilies(['Segoe UI', 'Arial', 'DejaVu Sans']); font.setPixelSize(16)
+    painter.setFont(font); painter.setPen(QColor(20, 20, 20))
+    for i, item in enumerate(["File", "Edit", "View", "Help", "Settings"]): painter.drawText(20 + i * 90, 28, item)
+    for row in range(8):
+        for column in range(3):
+            text = PARAGRAPHS[(row * 3 + column) % len(PARAGRAPHS)]
+            painter.drawText(QRect(40 + column * 620, 80 + row * 130, 560, 120), Qt.TextFlag.TextWordWrap, text)
+    painter.end()
+    ptr = page.constBits(); ptr.setsize(page.sizeInBytes())
+    full = np.frombuffer(ptr, np.uint8).reshape(page.height(), page.bytesPerLine())[:, :page.width()].copy()
+    sequence = [full[(k // 2) * 40:(k // 2) * 40 + 1080] for k in range(frames)]
+    return {'screens': [('sintética', sequence[0])], 'sequences': [('scroll sintético', sequence)]}
+
+def load_corpus(path):
+    import cv2
+    def read(p): return cv2.imread(p, cv2.IMREAD_GRAYSCALE)
+    entries = sorted(os.listdir(path))
+    screens = [(name, read(os.path.join(path, name))) for name in entries if name.lower().endswith(IMAGE_EXTENSIONS)]
+    sequences = []
+    for name in entries:
+        folder = os.path.join(path, name)
+        if not os.path.isdir(folder): continue
+        frames = [read(os.path.join(folder, f)) for f in sorted(os.listdir(folder)) if f.lower().endswith(IMAGE_EXTENSIONS)]
+        if frames: sequences.append((name, frames))
+    return {'screens': screens, 'sequences': sequences}
+
+def pointer_path(frame, steps):
+    # Recorrido determinista del puntero: se queda quieto un paso y luego avanza en diagonal
+    h, w = frame.shape[:2]; positions = []
+    for k in range(steps):
+        move = k // 2
+        cx = int(w * 0.2 + move * 150) % max(1, w - POINTER_WIDTH) + POINTER_WIDTH // 2
+        cy = int(h * 0.2 + move * 60) % max(1, h - POINTER_HEIGHT) + POINTER_HEIGHT // 2
+        positions.append({'left': cx - POINTER_WIDTH // 2, 'top': cy - POINTER_HEIGHT // 2, 'width': POINTER_WIDTH, 'height': POINTER_HEIGHT})
+    return positions
+
+# -----------------------------------------------------------------------------
+# ESCENARIOS
+# -----------------------------------------------------------------------------
+def run_scenario(mode, corpus, reader, tiled_engine, translator_latency, trace_dir=None):
+    # Cada modo empieza en frío: cachés, memoria de idiomas y contadores nuevos
+    capture = ReplayCapture(); labels = HeadlessLabels(); stub = StubTranslator(translator_latency)
+    language_id = LanguageIdentifier(OCR_LANGUAGES); language_id.load()
+    tracer = Tracer(enabled=True, history=None)
+    pipeline = TranslationPipeline(labels, backend_factory=lambda: stub, capture=capture,
+                                   translation_cache=TranslationCache(disk_path=None), language_id=language_id,
+                                   tiled_engine=tiled_engine, tracer=tracer)
+    steps = []
+    if mode == 'fullscreen':
+        for _, img in corpus['screens']: steps.append((img, lambda job: pipeline.run_fullscreen_ocr(job)))
+    for _, frames in corpus['sequences'] if mode != 'fullscreen' else []:
+        if mode == 'periodic':
+            region = PERIODIC_REGION; origin = (region['left'], region['top'])
+            steps.append((None, lambda job: pipeline.reset_selection()))
+            for img in frames: steps.append((img, lambda job, r=region, o=origin: pipeline.run_ocr_and_update(job, r, o)))
+        else:
+            for img, region in zip(frames, pointer_path(frames[0], len(frames))):
+                steps.append((img, lambda job, r=region: pipeline.run_pointer_ocr(job, r, (r['left'], r['top']))))
+
+    frames = 0; start = time.perf_counter()
+    for img, fn in steps:
+        if img is None: fn(None); continue
+        capture.set_frame(img); frames += 1
+        # El fotograma completo también entra en la traza, como span padre de las etapas
+        with tracer.span('frame', mode): fn(ReplayJob(reader, mode))
+    wall = time.perf_counter() - start
+    if trace_dir: os.makedirs(trace_dir, exist_ok=True); tracer.export_chrome_trace(os.path.join(trace_dir, f"{mode}.json"))
+    stats = pipeline.stats(); stages = stats.pop('stages')
+    pipeline.batch_translator.shutdown(); pipeline.translation_cache.close()
+    return {'frames': frames, 'wall_s': round(wall, 3), 'throughput_fps': round(frames / wall, 3) if wall else None,
+            'frame_latency': stages.pop('frame', {}), 'stages': stages,
+            'translator': {'backend': stub.stats(), 'batches': stats['batches'], 'cache': stats['translation_cache']},
+            'labels': {'visible': len(labels.active_translations), 'adds': labels.adds, 'removes': labels.removes},
+            'components': stats}
+
+def peak_rss_mib():
+    # ru_maxrss está en KiB en Linux
+    return {'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus')
+    parser.add_argument('--output')
+    parser.add_argument('--modes', nargs='+', default=['fullscreen', 'periodic', 'pointer'], choices=['fullscreen', 'periodic', 'pointer'])
+    parser.add_argument('--translator-latency', type=float, default=0.0)
+    parser.add_argument('--tile-workers', type=int, default=TILE_WORKERS)
+    parser.add_argument('--fp32', action='store_true')
+    parser.add_argument('--trace')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    quantize = OCR_QUANTIZE and not args.fp32
+    load_start = time.perf_counter()
+    reader = create_reader(quantize=quantize)
+    load_time = time.perf_counter() - load_start
+    tiled_engine = TiledOcrEngine(workers=args.tile_workers, quantize=quantize)
+
+    report = {'environment': {'python': sys.version.split()[0], 'platform': platform.platform(), 'cpus': os.cpu_count(),
+                              'ocr': describe_reader(quantize=quantize), 'tile_workers': args.tile_workers},
+              'corpus': {'path': args.corpus or 'sintético', 'screens': len(corpus['screens']),
+                         'sequences': len(corpus['sequences']), 'sequence_frames': sum(len(f) for _, f in corpus['sequences'])},
+              'translator_latency_s': args.translator_latency, 'reader_load_s': round(load_time, 3), 'modes': {}}
+    try:
+        for mode in args.modes: report['modes'][mode] = run_scenario(mode, corpus, reader, tiled_engine, args.translator_latency, args.trace)
+    finally:
+        tiled_engine.shutdown()
+    report['peak_rss_mib'] = peak_rss_mib()
+
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: f.write(text)
+    print(text)
@@ -0,0 +1,110 @@
+# Compara el lector de EasyOCR en fp32 con el modo int8 (cuantización dinámica): tamaño
+# del modelo, latencia por captura y precisión (CER) sobre un juego fijo de capturas.
+# Sin argumentos genera capturas sintéticas deterministas con Qt (fuentes reales, texto
+# conocido en inglés y español). Con imágenes propias no hay texto de referencia: se mide
+# el CER del modo int8 tomando la salida fp32 como referencia.
+# Uso: python -m benchmarks.bench_quantization [capturas.png ...] [--repeat 3]
+#      [--threads 4] [--languages en es]
+import argparse
+import io
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+
+from ocr_reader import OCR_LANGUAGES, create_reader
+
+OCR_PARAMS = {'width_ths': 0.6, 'text_threshold': 0.6, 'low_text': 0.4}
+SCREEN_LINES = [
+    ["File   Edit   View   Help", "Open recent projects", "The quick brown fox jumps over the lazy dog."],
+    ["Configuración de la cuenta", "Guardar los cambios antes de salir", "Descargar la actualización ahora"],
+    ["Battery health: 87% (good)", "Wireless network settings", "Sign in to continue to your account"],
+    ["El informe trimestral está listo", "Mostrar más resultados", "Versión 2.4.1 — notas de la publicación"],
+]
+
+def render_screens(sizes=(12, 14, 17, 20)):
+    # Devuelve [(nombre, imagen gris, texto esperado)]: cada juego de líneas en cada tamaño,
+    # alternando tema claro y oscuro
+    from PyQt6.QtGui import QGuiApplication, QImage, QPainter, QColor, QFont
+    app = QGuiApplication.instance() or QGuiApplication([])
+    screens = []
+    for i, lines in enumerate(SCREEN_LINES):
+        for j, size in enumerate(sizes):
+            dark = (i + j) % 2 == 1
+            image = QImage(640, 40 + len(lines) * size * 3, QImage.Format.Format_Grayscale8)
+            image.fill(QColor(30, 30, 30) if dark else QColor(245, 245, 245))
+            painter = QPainter(image); font = QFont(); font.setFamilies(['Segoe UI', 'Arial', 'DejaVu Sans']); font.setPixelSize(size)
+            painter.setFont(font); painter.setPen(QColor(230, 230, 230) if dark else QColor(20, 20, 20))
+            for k, line in enumerate(lines): painter.drawText(20, 30 + k * size * 3, line)
+            painter.end()
+            ptr = image.constBits(); ptr.setsize(image.sizeInBytes())
+            img = np.frombuffer(ptr, np.uint8).reshape(image.height(), image.bytesPerLine())[:, :image.width()].copy()
+            screens.append((f"sintética {i}-{size}px{' oscura' if dark else ''}", img, " ".join(lines)))
+    return screens
+
+def load_screens(paths):
+    import cv2
+    return [(os.path.basename(p), cv2.imread(p, cv2.IMREAD_GRAYSCALE), None) for p in paths]
+
+def edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def cer(predicted, reference):
+    predicted = " ".join(predicted.split()); reference = " ".join(reference.split())
+    return edit_distance(predicted, reference) / max(1, len(reference))
+
+def read_text(reader, img):
+    results = reader.readtext(img, **OCR_PARAMS)
+    results.sort(key=lambda r: (round(r[0][0][1] / 10), r[0][0][0]))
+    return " ".join(text for _, text, _ in results)
+
+def model_size(reader):
+    # Tamaño serializado de detector + reconocedor (los pesos int8 empaquetados no aparecen en parameters())
+    import torch
+    buffer = io.BytesIO(); torch.save({'detector': reader.detector.state_dict(), 'recognizer': reader.recognizer.state_dict()}, buffer)
+    return buffer.tell() / 2 ** 20
+
+def run(name, screens, repeat, quantize, threads, languages):
+    start = time.perf_counter(); reader = create_reader(languages, quantize=quantize, torch_threads=threads)
+    load_time = time.perf_counter() - start
+    read_text(reader, screens[0][1])  # Calentamiento
+    texts = []; latencies = []
+    for _, img, _ in screens:
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter(); text = read_text(reader, img); times.append(time.perf_counter() - t0)
+        texts.append(text); latencies.append(min(times))
+    print(f"{name}: carga {load_time:.1f} s, modelo {model_size(reader):.1f} MiB, "
+          f"latencia mediana {np.median(latencies) * 1000:.0f} ms "
+          f"(p95 {np.percentile(latencies, 95) * 1000:.0f} ms)")
+    return texts, latencies
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('images', nargs='*')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--languages', nargs='+', default=list(OCR_LANGUAGES))
+    args = parser.parse_args()
+    screens = load_screens(args.images) if args.images else render_screens()
+
+    fp32_texts, fp32_times = run("fp32", screens, args.repeat, False, args.threads, args.languages)
+    int8_texts, int8_times = run("int8", screens, args.repeat, True, args.threads, args.languages)
+
+    print(f"\n{'Captura':<28} {'fp32 ms':>8} {'int8 ms':>8} {'CER fp32':>9} {'CER int8':>9}")
+    fp32_cer = []; int8_cer = []
+    for (name, _, expected), a, b, ta, tb in zip(screens, fp32_texts, int8_texts, fp32_times, int8_times):
+        reference = expected if expected is not None else a
+        fp32_cer.append(cer(a, reference)); int8_cer.append(cer(b, reference))
+        print(f"{name:<28} {ta * 1000:8.0f} {tb * 1000:8.0f} {fp32_cer[-1]:9.3f} {int8_cer[-1]:9.3f}")
+    print(f"{'Media':<28} {np.mean(fp32_times) * 1000:8.0f} {np.mean(int8_times) * 1000:8.0f} {np.mean(fp32_cer):9.3f} {np.mean(int8_cer):9.3f}")
+    if not args.images: print("(CER frente al texto dibujado)")
+    else: print("(sin texto de referencia: CER frente a la salida fp32)")
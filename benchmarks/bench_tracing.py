@@ -0,0 +1,65 @@
+# Mide el coste de las trazas por etapa: un span desactivado (lo habitual, HUD cerrado)
+# frente a un span activo y frente a no medir nada, en el hilo que llama. También mide
+# el coste de refrescar y pintar el HUD y el de exportar la traza Chrome resultante.
+# Uso: python -m benchmarks.bench_tracing [--spans 200000] [--trace traza.json]
+# Funciona sin pantalla (QT_QPA_PLATFORM=offscreen por defecto).
+import argparse
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+
+from tracing import Tracer
+
+STAGES = ['capture', 'diff', 'ocr', 'layout', 'language_id', 'translate']
+MODES = ['pointer', 'fullscreen', 'periodic_rect']
+
+def per_span_ns(tracer, spans):
+    # Bucle con el mismo trabajo trivial dentro del span; devuelve ns por iteración
+    start = time.perf_counter_ns()
+    if tracer is None:
+        for i in range(spans): i + 1
+    else:
+        for i in range(spans):
+            with tracer.span('ocr', 'pointer'): i + 1
+    return (time.perf_counter_ns() - start) / spans
+
+def fill(tracer, rng, events):
+    # Duraciones sintéticas log-normales por (modo, etapa), registradas directamente
+    now = time.perf_counter_ns()
+    for k in range(events):
+        mode = MODES[k % len(MODES)]; stage = STAGES[(k // len(MODES)) % len(STAGES)]
+        duration = int(rng.lognormal(np.log(5 + 20 * STAGES.index(stage)), 0.8) * 1e6)
+        tracer.record(stage, mode, now, now + duration, {}); now += duration
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--spans', type=int, default=200000)
+    parser.add_argument('--trace')
+    args = parser.parse_args()
+
+    baseline = min(per_span_ns(None, args.spans) for _ in range(3))
+    disabled = min(per_span_ns(Tracer(enabled=False), args.spans) for _ in range(3))
+    enabled = min(per_span_ns(Tracer(enabled=True, max_events=args.spans), args.spans) for _ in range(3))
+    print(f"Sin medir:         {baseline:8.0f} ns/iteración")
+    print(f"Span desactivado:  {disabled:8.0f} ns/iteración (+{disabled - baseline:.0f} ns)")
+    print(f"Span activo:       {enabled:8.0f} ns/iteración (+{enabled - baseline:.0f} ns)")
+
+    from PyQt6.QtWidgets import QApplication
+    from performance_hud import PerformanceHud
+    app = QApplication.instance() or QApplication([])
+    tracer = Tracer(enabled=True); fill(tracer, np.random.default_rng(0), 20000)
+    hud = PerformanceHud(tracer); hud.show(); app.processEvents()
+    times = []
+    for _ in range(50):
+        t0 = time.perf_counter(); hud.refresh(); hud.repaint(); times.append(time.perf_counter() - t0)
+    print(f"HUD ({len(hud.rows)} filas): refresco + pintado {np.median(times) * 1000:.2f} ms (mediana)")
+
+    path = args.trace or os.path.join(tempfile.mkdtemp(), 'traza.json')
+    t0 = time.perf_counter(); tracer.export_chrome_trace(path); export_time = time.perf_counter() - t0
+    with open(path, encoding='utf-8') as f: events = json.load(f)['traceEvents']
+    print(f"Exportación Chrome: {len(events)} eventos en {export_time * 1000:.0f} ms -> {path}")
@@ -0,0 +1,58 @@
+# Compara la traducción línea a línea (ruta anterior) con la traducción por lotes
+# contra el servidor falso local, sin red.
+# Uso: python -m benchmarks.bench_translation [--lines 60] [--latency 0.15]
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from deep_translator import GoogleTranslator
+
+from fake_translation_server import FakeTranslationServer
+from translation_cache import TranslationCache, CachedTranslator
+from batch_translator import BatchTranslator
+
+def make_translator(server):
+    translator = GoogleTranslator(source='auto', target='es'); translator._base_url = server.url
+    return translator
+
+def synthetic_lines(count):
+    words = ["File", "Edit", "View", "Settings", "open the project", "save all changes", "the quick brown fox",
+             "jumps over the lazy dog", "Download", "Recent documents", "Help and feedback"]
+    return [f"{words[i % len(words)]} {i}" for i in range(count)]
+
+def bench_per_line(server, lines):
+    # Un GoogleTranslator por petición: la instancia no es segura entre hilos
+    start = time.perf_counter(); first = None
+    with ThreadPoolExecutor() as executor:
+        for _ in executor.map(lambda text: make_translator(server).translate(text), lines):
+            if first is None: first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+def bench_batched(server, lines):
+    cached = CachedTranslator(make_translator(server), TranslationCache(disk_path=None), source='auto', target='es')
+    batcher = BatchTranslator(cached, backend_factory=lambda: make_translator(server))
+    start = time.perf_counter(); first = []
+    results = batcher.translate_lines(lines, on_result=lambda text, tr: first or first.append(time.perf_counter() - start))
+    total = time.perf_counter() - start; cold_requests = server.stats()['requests']
+    assert all(results[text] == f"[es] {text}" for text in lines), "Las traducciones no corresponden a sus líneas"
+    # Segunda pasada: todo sale de la caché
+    server.reset_stats(); start = time.perf_counter(); batcher.translate_lines(lines)
+    warm = time.perf_counter() - start; warm_requests = server.stats()['requests']
+    batcher.shutdown()
+    return cold_requests, first[0], total, warm, warm_requests
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.15)
+    args = parser.parse_args()
+    server = FakeTranslationServer(base_latency=args.latency).start()
+    lines = synthetic_lines(args.lines)
+
+    first, total = bench_per_line(server, lines)
+    print(f"Línea a línea: {server.stats()['requests']} peticiones, primera {first*1000:.0f} ms, total {total*1000:.0f} ms")
+    server.reset_stats()
+    requests, first, total, warm, warm_requests = bench_batched(server, lines)
+    print(f"Por lotes:     {requests} peticiones, primera {first*1000:.0f} ms, total {total*1000:.0f} ms")
+    print(f"Caché caliente: {warm_requests} peticiones, total {warm*1000:.1f} ms")
+    server.stop()
@@ -0,0 +1,127 @@
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import mss
+
+# --- CONFIGURACIÓN ---
+OVERLAY_CELL_SIZE = 64     # Rejilla (px físicos de pantalla) en la que se recuerdan los píxeles sin etiquetas
+OVERLAY_MAX_CELLS = 4096   # Celdas recordadas (64x64 px en escala de grises: 16 MiB como máximo)
+OVERLAY_MARGIN = 2         # Margen alrededor de cada etiqueta (borde, antialiasing y redondeo de la escala)
+WDA_EXCLUDEFROMCAPTURE = 0x11
+
+def exclude_window_from_capture(win_id):
+    # Windows 10 2004+: la ventana se sigue viendo, pero BitBlt (mss) ya no la incluye en las capturas.
+    # Devuelve False si el sistema no lo permite; entonces hay que borrar el overlay con OverlayEraser.
+    if sys.platform != 'win32': return False
+    import ctypes
+    return bool(ctypes.windll.user32.SetWindowDisplayAffinity(ctypes.c_void_p(win_id), WDA_EXCLUDEFROMCAPTURE))
+
+# -----------------------------------------------------------------------------
+# SERVICIO DE CAPTURA PERSISTENTE
+# -----------------------------------------------------------------------------
+class CaptureService:
+    # Mantiene un grabber de mss abierto por hilo y convierte cada captura a escala de
+    # grises sobre búferes preasignados. El array devuelto con reuse=True se reescribe en
+    # la siguiente captura del mismo hilo con el mismo tamaño: quien lo necesite más tiempo
+    # debe copiarlo (o pedir reuse=False).
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.frames = 0; self.buffer_allocations = 0
+
+    def grabber(self):
+        if not hasattr(self.local, 'sct'): self.local.sct = mss.mss(); self.local.buffers = {}
+        return self.local.sct
+
+    @property
+    def monitors(self):
+        return self.grabber().monitors
+
+    def grab_bgra(self, region):
+        # Vista NumPy sobre el búfer BGRA de mss, sin copia
+        sct_img = self.grabber().grab(region)
+        return np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+
+    def buffer(self, key, shape):
+        buffers = self.local.buffers
+        buf = buffers.get(key)
+        if buf is None or buf.shape != shape:
+            buf = buffers[key] = np.empty(shape, dtype=np.uint8)
+            with self.lock: self.buffer_allocations += 1
+        return buf
+
+    def grab_gray(self, region, scale=1.0, reuse=True):
+        import cv2
+        bgra = self.grab_bgra(region)
+        h, w = bgra.shape[:2]
+        gray = self.buffer('gray', (h, w)) if reuse else np.empty((h, w), dtype=np.uint8)
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY, dst=gray)
+        if scale != 1.0:
+            # Captura reducida: las coordenadas resultantes deben dividirse entre `scale`
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            small = self.buffer('scaled', (size[1], size[0])) if reuse else np.empty((size[1], size[0]), dtype=np.uint8)
+            cv2.resize(gray, size, dst=small, interpolation=cv2.INTER_AREA)
+            gray = small
+        with self.lock: self.frames += 1
+        return gray
+
+    def close(self):
+        # Solo cierra el grabber del hilo que llama; los demás se liberan con su hilo
+        if hasattr(self.local, 'sct'): self.local.sct.close(); del self.local.sct
+
+    def stats(self):
+        with self.lock: return {'frames': self.frames, 'buffer_allocations': self.buffer_allocations}
+
+# -----------------------------------------------------------------------------
+# BORRADO DE LAS ETIQUETAS PROPIAS EN LAS CAPTURAS
+# -----------------------------------------------------------------------------
+class OverlayEraser:
+    # Si el overlay no se puede excluir de la captura, mss ve nuestras etiquetas encima del texto
+    # original. erase() pone bajo cada etiqueta los píxeles que había en ese sitio la última vez
+    # que se vio sin ella (el fondo si nunca se vio), así la comparación de capturas, la caché
+    # espacial y el OCR trabajan sobre la pantalla sin overlay.
+    # rects_provider() devuelve los rectángulos (x0, y0, x1, y1) de las etiquetas en px físicos de pantalla.
+    def __init__(self, rects_provider, cell_size=OVERLAY_CELL_SIZE, max_cells=OVERLAY_MAX_CELLS, margin=OVERLAY_MARGIN):
+        self.rects_provider = rects_provider
+        self.cell_size = cell_size; self.max_cells = max_cells; self.margin = margin
+        self.cells = OrderedDict()   # celda -> píxeles sin etiquetas (cell_size x cell_size)
+        self.lock = threading.Lock()
+        self.frames_erased = 0; self.pixels_erased = 0
+
+    def erase(self, origin, img_gray):
+        # Modifica img_gray en sitio y lo devuelve
+        ox, oy = origin; h, w = img_gray.shape[:2]; cs = self.cell_size; m = self.margin
+        rects = []
+        for x0, y0, x1, y1 in self.rects_provider():
+            x0 = max(0, int(x0) - m - ox); y0 = max(0, int(y0) - m - oy)
+            x1 = min(w, int(x1) + m + 1 - ox); y1 = min(h, int(y1) + m + 1 - oy)
+            if x1 > x0 and y1 > y0: rects.append((x0, y0, x1, y1))
+        with self.lock:
+            if rects:
+                mask = np.zeros((h, w), dtype=bool)
+                for x0, y0, x1, y1 in rects: mask[y0:y1, x0:x1] = True
+                background = int(np.median(img_gray[::8, ::8]))
+                touched = {(cx, cy) for x0, y0, x1, y1 in rects
+                           for cy in range((y0 + oy) // cs, (y1 - 1 + oy) // cs + 1) for cx in range((x0 + ox) // cs, (x1 - 1 + ox) // cs + 1)}
+                for cx, cy in touched:
+                    cx0 = cx * cs - ox; cy0 = cy * cs - oy
+                    ix0, iy0, ix1, iy1 = max(0, cx0), max(0, cy0), min(w, cx0 + cs), min(h, cy0 + cs)
+                    hidden = mask[iy0:iy1, ix0:ix1]; view = img_gray[iy0:iy1, ix0:ix1]
+                    clean = self.cells.get((cx, cy))
+                    view[hidden] = background if clean is None else clean[iy0 - cy0:iy1 - cy0, ix0 - cx0:ix1 - cx0][hidden]
+                self.frames_erased += 1; self.pixels_erased += int(mask.sum())
+            # Se recuerda cada celda completa de la captura ya limpia, para cuando la tape una etiqueta
+            for cy in range(-(-oy // cs), (oy + h) // cs):
+                y0 = cy * cs - oy
+                for cx in range(-(-ox // cs), (ox + w) // cs):
+                    x0 = cx * cs - ox
+                    self.cells[(cx, cy)] = img_gray[y0:y0 + cs, x0:x0 + cs].copy(); self.cells.move_to_end((cx, cy))
+            while len(self.cells) > self.max_cells: self.cells.popitem(last=False)
+        return img_gray
+
+    def clear(self):
+        with self.lock: self.cells.clear()
+
+    def stats(self):
+        with self.lock: return {'cells': len(self.cells), 'frames_erased': self.frames_erased, 'pixels_erased': self.pixels_erased}
@@ -0,0 +1,116 @@
+import html
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from translation_backends import TokenBucket
+
+# --- CONFIGURACIÓN ---
+FAKE_BASE_LATENCY = 0.15      # Segundos por petición (ida y vuelta simulada)
+FAKE_PER_CHAR_LATENCY = 0.00002
+FAKE_RETRY_AFTER = 1          # Segundos que se anuncian en Retry-After al limitar
+
+def fake_translate(text, target):
+    # Traducción determinista: cada línea se marca con el idioma destino
+    return "\n".join(f"[{target}] {line}" if line.strip() else line for line in text.split("\n"))
+
+class FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128   # Con la cola por defecto (5) las ráfagas pierden SYN y esperan 1 s a retransmitir
+
+# -----------------------------------------------------------------------------
+# SERVIDOR LOCAL QUE IMITA translate.google.com/m
+# -----------------------------------------------------------------------------
+class FakeTranslationServer:
+    # Uso: server = FakeTranslationServer().start(); translator._base_url = server.url
+    # (o GoogleWebBackend(url=server.url)). Para probar la contrapresión: rate_limit responde
+    # 429 por encima de N peticiones/s y max_in_flight responde 503 con más de N simultáneas.
+    def __init__(self, host="127.0.0.1", port=0, base_latency=FAKE_BASE_LATENCY, per_char_latency=FAKE_PER_CHAR_LATENCY,
+                 rate_limit=None, burst=None, max_in_flight=None, retry_after=FAKE_RETRY_AFTER):
+        self.base_latency = base_latency; self.per_char_latency = per_char_latency
+        self.bucket = TokenBucket(rate_limit, burst or max(1, int(rate_limit))) if rate_limit else None
+        self.max_in_flight = max_in_flight; self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0; self.chars = 0; self.throttled = 0; self.rejected = 0
+        self.connections = 0; self.in_flight = 0; self.peak_in_flight = 0
+        self.httpd = FakeHTTPServer((host, port), self.make_handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/m"
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1: las conexiones se mantienen abiertas y se puede medir su reutilización
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Cabeceras y cuerpo se escriben por separado: sin esto, Nagle + ACK diferido añaden ~40 ms por petición
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server.lock: server.connections += 1
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                text = params.get('q', [''])[0]; target = params.get('tl', ['es'])[0]
+                if server.bucket is not None and not server.bucket.try_acquire():
+                    with server.lock: server.throttled += 1
+                    return self.reply(429, "Too Many Requests", retry_after=server.retry_after)
+                with server.lock:
+                    if server.max_in_flight is not None and server.in_flight >= server.max_in_flight:
+                        server.rejected += 1; busy = True
+                    else:
+                        busy = False; server.in_flight += 1; server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                        server.requests += 1; server.chars += len(text)
+                if busy: return self.reply(503, "Service Unavailable", retry_after=server.retry_after)
+                try: time.sleep(server.base_latency + server.per_char_latency * len(text))
+                finally:
+                    with server.lock: server.in_flight -= 1
+                body = f'<html><body><div class="result-container">{html.escape(fake_translate(text, target))}</div></body></html>'
+                self.reply(200, body)
+
+            def reply(self, status, body, retry_after=None):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                if retry_after is not None: self.send_header("Retry-After", str(retry_after))
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers(); self.wfile.write(data)
+
+            def log_message(self, format, *args): pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True); self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown(); self.httpd.server_close()
+
+    def reset_stats(self):
+        with self.lock: self.requests = 0; self.chars = 0; self.throttled = 0; self.rejected = 0; self.connections = 0; self.peak_in_flight = 0
+
+    def stats(self):
+        with self.lock:
+            return {'requests': self.requests, 'chars': self.chars, 'throttled': self.throttled, 'rejected': self.rejected,
+                    'connections': self.connections, 'peak_in_flight': self.peak_in_flight}
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=FAKE_BASE_LATENCY)
+    parser.add_argument('--rate-limit', type=float)
+    parser.add_argument('--max-in-flight', type=int)
+    args = parser.parse_args()
+    server = FakeTranslationServer(port=args.port, base_latency=args.latency, rate_limit=args.rate_limit, max_in_flight=args.max_in_flight).start()
+    print(f"Servidor de traducción falso en {server.url} (Ctrl+C para salir)")
+    try: server.thread.join()
+    except KeyboardInterrupt: server.stop()
@@ -0,0 +1,107 @@
+import itertools
+import threading
+import numpy as np
+
+# --- CONFIGURACIÓN ---
+DIFF_TILE_SIZE = 64          # Tamaño (px físicos) de cada tesela de comparación
+DIFF_BLOCK_SIZE = 8          # Cada tesela se resume en bloques de 8x8 px promediados
+DIFF_BLOCK_THRESHOLD = 2.0   # Diferencia media (0-255) de un bloque para marcar su tesela como cambiada
+DIFF_FULL_FRACTION = 0.5     # Si cambia más de esta fracción de teselas se reprocesa todo
+
+def grow_regions(regions, rects):
+    # Amplía cada franja (x0, y0, x1, y1) hasta contener entero cualquier rectángulo que corte:
+    # una línea que cruza el borde se vuelve a detectar completa y no recortada. Las franjas que
+    # pasan a solaparse se unen.
+    regions = [tuple(r) for r in regions]; grown = True
+    while grown:
+        grown = False
+        for i, (x0, y0, x1, y1) in enumerate(regions):
+            for r in rects:
+                if r[0] < x1 and r[2] > x0 and r[1] < y1 and r[3] > y0 and not (x0 <= r[0] and r[2] <= x1 and y0 <= r[1] and r[3] <= y1):
+                    x0, y0, x1, y1 = min(x0, r[0]), min(y0, r[1]), max(x1, r[2]), max(y1, r[3]); grown = True
+            regions[i] = (x0, y0, x1, y1)
+        for i, j in itertools.combinations(range(len(regions)), 2):
+            a, b = regions[i], regions[j]
+            if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                regions[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])); del regions[j]; grown = True; break
+    return regions
+
+# -----------------------------------------------------------------------------
+# RESULTADO DE UNA COMPARACIÓN
+# -----------------------------------------------------------------------------
+class FrameChange:
+    UNCHANGED = "unchanged"
+    PARTIAL = "partial"
+    FULL = "full"
+
+    def __init__(self, status, changed_tiles=None, regions=None):
+        self.status = status
+        self.changed_tiles = changed_tiles  # máscara (filas, columnas) de teselas cambiadas
+        self.regions = regions or []        # bandas (x0, y0, x1, y1) en píxeles a reprocesar
+
+    def overlaps(self, bbox):
+        # bbox con el formato de EasyOCR: [[x0,y0],[x1,y0],[x1,y1],[x0,y1]]
+        if self.status == FrameChange.FULL: return True
+        top, bottom = bbox[0][1], bbox[2][1]; left, right = bbox[0][0], bbox[2][0]
+        return any(top < y1 and bottom > y0 and left < x1 and right > x0 for x0, y0, x1, y1 in self.regions)
+
+# -----------------------------------------------------------------------------
+# COMPUERTA DE CAMBIOS ENTRE CAPTURAS
+# -----------------------------------------------------------------------------
+class FrameDiffGate:
+    def __init__(self, tile_size=DIFF_TILE_SIZE, block_size=DIFF_BLOCK_SIZE,
+                 threshold=DIFF_BLOCK_THRESHOLD, full_fraction=DIFF_FULL_FRACTION):
+        self.tile_size = tile_size; self.block_size = block_size
+        self.threshold = threshold; self.full_fraction = full_fraction
+        self.lock = threading.Lock()
+        self.last_signature = None
+        self.frames_skipped = 0; self.frames_partial = 0; self.frames_processed = 0
+
+    def reset(self):
+        with self.lock: self.last_signature = None
+
+    def compute_signature(self, img_gray):
+        # Firma reducida: media de cada bloque, agrupada como (filas, bloques, columnas, bloques)
+        ts, bs = self.tile_size, self.block_size
+        h, w = img_gray.shape[:2]
+        rows = -(-h // ts); cols = -(-w // ts)
+        pad_h, pad_w = rows * ts - h, cols * ts - w
+        if pad_h or pad_w: img_gray = np.pad(img_gray, ((0, pad_h), (0, pad_w)), mode='edge')
+        per_tile = ts // bs
+        blocks = img_gray.reshape(rows, per_tile, bs, cols, per_tile, bs).mean(axis=(2, 5), dtype=np.float32)
+        return blocks
+
+    def check(self, img_gray):
+        signature = self.compute_signature(img_gray)
+        with self.lock:
+            previous = self.last_signature; self.last_signature = signature
+            if previous is None or previous.shape != signature.shape:
+                self.frames_processed += 1
+                return FrameChange(FrameChange.FULL)
+            changed_tiles = (np.abs(signature - previous) > self.threshold).any(axis=(1, 3))
+            if not changed_tiles.any():
+                self.frames_skipped += 1
+                return FrameChange(FrameChange.UNCHANGED, changed_tiles)
+            if changed_tiles.mean() > self.full_fraction:
+                self.frames_processed += 1
+                return FrameChange(FrameChange.FULL, changed_tiles)
+            self.frames_partial += 1
+            return FrameChange(FrameChange.PARTIAL, changed_tiles, self.changed_bands(changed_tiles, img_gray.shape))
+
+    def changed_bands(self, changed_tiles, shape):
+        # Las líneas de texto son horizontales: se reprocesa el ancho completo de cada
+        # franja de filas cambiadas, ampliada una tesela arriba y abajo.
+        h, w = shape[:2]; ts = self.tile_size
+        changed_rows = np.flatnonzero(changed_tiles.any(axis=1)).tolist()
+        bands = []
+        for row in changed_rows:
+            y0 = max(0, (row - 1) * ts); y1 = min(h, (row + 2) * ts)
+            if bands and y0 <= bands[-1][3]: bands[-1] = (0, bands[-1][1], w, y1)
+            else: bands.append((0, y0, w, y1))
+        return bands
+
+    def stats(self):
+        with self.lock:
+            total = self.frames_skipped + self.frames_partial + self.frames_processed
+            return {'skipped': self.frames_skipped, 'partial': self.frames_partial,
+                    'processed': self.frames_processed, 'total': total}
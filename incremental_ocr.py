@@ -0,0 +1,117 @@
+import hashlib
+import threading
+
+from frame_diff import FrameChange, grow_regions
+from translation_cache import LRUCache
+from text_presence import find_text_regions
+
+# --- CONFIGURACIÓN ---
+INCREMENTAL_MEMO_ENTRIES = 4000      # Recortes recordados (hash del recorte -> texto reconocido)
+INCREMENTAL_REDETECT_FRACTION = 0.3  # Fracción de teselas cambiadas a partir de la cual se detecta todo de nuevo
+DETECT_PARAMS = {'width_ths': 0.6, 'text_threshold': 0.6, 'low_text': 0.4}
+
+def crop_hash(img_gray, box):
+    x_min, x_max, y_min, y_max = box
+    crop = img_gray[y_min:y_max, x_min:x_max]
+    digest = hashlib.blake2b(str(crop.shape).encode('ascii'), digest_size=16)
+    digest.update(crop.tobytes())
+    return digest.digest()
+
+def horizontal_envelope(points):
+    # Las cajas giradas (free_list) se reconocen con su rectángulo envolvente
+    xs = [p[0] for p in points]; ys = [p[1] for p in points]
+    return [min(xs), max(xs), min(ys), max(ys)]
+
+# -----------------------------------------------------------------------------
+# OCR INCREMENTAL: DETECCIÓN RECORDADA + RECONOCIMIENTO SOLO DE LO QUE CAMBIÓ
+# -----------------------------------------------------------------------------
+class IncrementalOcr:
+    # Sustituye a reader.readtext para capturas repetidas de la misma zona, comparadas por el
+    # llamador (FrameDiffGate). Devuelve resultados con el mismo formato: [(bbox, texto, confianza)].
+    def __init__(self, memo_entries=INCREMENTAL_MEMO_ENTRIES, redetect_fraction=INCREMENTAL_REDETECT_FRACTION, prefilter=True):
+        self.prefilter = prefilter; self.redetect_fraction = redetect_fraction
+        self.memo = LRUCache(memo_entries)
+        self.boxes = None; self.last_results = None
+        self.lock = threading.Lock()
+        self.full_detections = 0; self.partial_detections = 0; self.recognized = 0; self.memo_hits = 0
+        self.area_total = 0; self.area_detected = 0
+
+    def reset(self):
+        with self.lock: self.boxes = None; self.last_results = None
+
+    def detect(self, reader, img_gray, offset_x=0, offset_y=0):
+        # El pre-filtro descarta las zonas sin texto; el detector solo ve los bloques candidatos
+        h, w = img_gray.shape[:2]
+        regions = find_text_regions(img_gray) if self.prefilter else [(0, 0, w, h)]
+        with self.lock:
+            self.area_total += w * h; self.area_detected += sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions)
+        boxes = []
+        for x0, y0, x1, y1 in regions:
+            boxes += self.detect_region(reader, img_gray[y0:y1, x0:x1], offset_x + x0, offset_y + y0)
+        return boxes
+
+    def detect_region(self, reader, img_gray, offset_x, offset_y):
+        horizontal_list, free_list = reader.detect(img_gray, **DETECT_PARAMS)
+        boxes = [list(b) for b in horizontal_list[0]] + [horizontal_envelope(p) for p in free_list[0]]
+        h, w = img_gray.shape[:2]
+        # Se recortan a la imagen, igual que hace EasyOCR al extraer cada región
+        return [[int(max(0, b[0])) + offset_x, int(min(b[1], w)) + offset_x, int(max(0, b[2])) + offset_y, int(min(b[3], h)) + offset_y]
+                for b in boxes if min(b[1], w) > max(0, b[0]) and min(b[3], h) > max(0, b[2])]
+
+    def update_boxes(self, reader, img_gray, change):
+        # Detección completa si no hay cajas previas o cambió más de redetect_fraction de las
+        # teselas; si no, solo se vuelve a detectar dentro de las franjas cambiadas.
+        if self.boxes is None or change.status == FrameChange.FULL or change.changed_tiles.mean() > self.redetect_fraction:
+            with self.lock: self.full_detections += 1
+            return self.detect(reader, img_gray)
+        if change.status == FrameChange.UNCHANGED: return self.boxes
+        with self.lock: self.partial_detections += 1
+        # Las franjas se amplían con las cajas que cortan; el llamador ve las mismas franjas al
+        # decidir qué líneas vuelve a traducir
+        change.regions = grow_regions(change.regions, [(b[0], b[2], b[1], b[3]) for b in self.boxes])
+        boxes = [b for b in self.boxes if not change.overlaps([[b[0], b[2]], [b[1], b[2]], [b[1], b[3]], [b[0], b[3]]])]
+        for x0, y0, x1, y1 in change.regions:
+            boxes += self.detect(reader, img_gray[y0:y1, x0:x1], x0, y0)
+        return boxes
+
+    def readtext(self, reader, img_gray, change):
+        # change: FrameChange de esta captura respecto a la anterior
+        if change.status == FrameChange.UNCHANGED and self.last_results is not None: return list(self.last_results)
+        self.boxes = self.update_boxes(reader, img_gray, change)
+        self.last_results = self.recognize_boxes(reader, img_gray, self.boxes)
+        return list(self.last_results)
+
+    def read_regions(self, reader, img_gray, regions):
+        # Sin memoria de disposición (la ventana se mueve): detección en cada región y
+        # reconocimiento apoyado en la memoria de recortes
+        with self.lock: self.full_detections += 1
+        boxes = []
+        for x0, y0, x1, y1 in regions: boxes += self.detect(reader, img_gray[y0:y1, x0:x1], x0, y0)
+        return self.recognize_boxes(reader, img_gray, boxes)
+
+    def recognize_boxes(self, reader, img_gray, boxes):
+        h, w = img_gray.shape[:2]
+        # Las cajas vacías al recortarlas a la imagen no se pueden reconocer
+        boxes = [b for b in boxes if min(b[1], w) > max(0, b[0]) and min(b[3], h) > max(0, b[2])]
+        results = [None] * len(boxes); pending = []
+        for i, box in enumerate(boxes):
+            key = crop_hash(img_gray, box); memo = self.memo.get(key)
+            if memo is not None: results[i] = memo
+            else: pending.append((i, key))
+        if pending:
+            # EasyOCR descarta en silencio las cajas que no puede redimensionar: cada resultado se
+            # asocia a su caja por las coordenadas que devuelve, no por su posición en la lista
+            recognized = reader.recognize(img_gray, horizontal_list=[boxes[i] for i, _ in pending], free_list=[], reformat=False)
+            by_box = {(int(p[0][0]), int(p[0][1]), int(p[2][0]), int(p[2][1])): (text, conf) for p, text, conf in recognized}
+            for i, key in pending:
+                b = boxes[i]; result = by_box.get((max(0, b[0]), max(0, b[2]), min(b[1], w), min(b[3], h)))
+                if result is not None: results[i] = result; self.memo.put(key, result)
+        with self.lock: self.recognized += len(pending); self.memo_hits += len(boxes) - len(pending)
+        return [([[b[0], b[2]], [b[1], b[2]], [b[1], b[3]], [b[0], b[3]]], r[0], r[1])
+                for b, r in zip(boxes, results) if r is not None]
+
+    def stats(self):
+        with self.lock:
+            return {'full_detections': self.full_detections, 'partial_detections': self.partial_detections,
+                    'recognized': self.recognized, 'memo_hits': self.memo_hits,
+                    'detected_area_fraction': round(self.area_detected / self.area_total, 3) if self.area_total else None}
@@ -0,0 +1,117 @@
+import re
+import threading
+import time
+
+from translation_cache import LRUCache, normalize_text
+
+# --- CONFIGURACIÓN ---
+LANGUAGE_MEMO_ENTRIES = 20000   # Textos recordados (texto normalizado -> idioma)
+LANGUAGE_FAST_COVERAGE = 0.3    # Fracción mínima de palabras reconocidas para decidir sin langdetect
+LANGUAGE_FAST_MARGIN = 2.0      # El idioma ganador debe puntuar al menos esto veces más que el segundo
+LANGUAGE_OTHER_PRIOR = 0.01     # Probabilidad a priori de langdetect para idiomas no configurados
+LANGUAGE_SEED = 0               # Semilla de langdetect: mismo texto, mismo resultado
+LANGUAGE_UNKNOWN = ''           # Marca en la memoria para "sin letras / no detectable"
+
+# Palabras frecuentes (y vocabulario típico de interfaz) exclusivas de cada idioma; las
+# compartidas ("a", "no", "me", "he"...) no cuentan para ninguno
+LANGUAGE_WORDS = {
+    'en': frozenset("""the and of to in is are was were be been being for on with as at by this that these those it its
+        from or an not you your we our they their them will can could would should have has had do does did but if then
+        than there here what which who when where why how all any more most some into about after before over under up
+        out only also just new please click open save file settings help view edit close cancel search home back next
+        sign account download select show hide delete copy paste cut undo redo tools window options language recent
+        loading error warning yes enter continue learn read more""".split()),
+    'es': frozenset("""el la los las un una unos unas y o u de del al en que por para con sin se su sus es son está
+        están estar como más pero muy ya este esta estos estas ese esa eso lo le les nos hay fue ser sobre entre cuando
+        donde también porque si sí todo todos toda todas otra otro puede pueden desde hasta cada hacer archivo editar
+        ver ayuda configuración ajustes guardar abrir cerrar cancelar aceptar buscar inicio siguiente anterior
+        descargar seleccionar mostrar ocultar cuenta iniciar sesión salir nuevo nueva eliminar borrar copiar pegar
+        cortar deshacer rehacer herramientas ventana opciones idioma recientes cargando advertencia sí continuar""".split()),
+}
+# Caracteres que por sí solos delatan un idioma (cada aparición suma un punto)
+LANGUAGE_CHARS = {'es': frozenset("ñáéíóúü¿¡")}
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# -----------------------------------------------------------------------------
+# IDENTIFICACIÓN DE IDIOMA: MEMORIA + HEURÍSTICAS + LANGDETECT POR LOTES
+# -----------------------------------------------------------------------------
+class LanguageIdentifier:
+    # Sustituye a langdetect.detect línea a línea. Cada texto pasa por:
+    #   1. memoria por texto normalizado,
+    #   2. vía rápida (palabras y caracteres exclusivos de los idiomas configurados),
+    #   3. langdetect con semilla fija y probabilidades a priori a favor de esos idiomas.
+    # Devuelve el código de idioma o None si el texto no tiene letras o no se pudo detectar.
+    def __init__(self, languages=('en', 'es'), memo_entries=LANGUAGE_MEMO_ENTRIES):
+        self.languages = tuple(languages)
+        self.memo = LRUCache(memo_entries)
+        self.lock = threading.Lock()
+        self.factory = None; self.prior_map = None
+        self.passes = 0; self.lines = 0; self.memo_hits = 0; self.fast_path = 0; self.detector_calls = 0
+        self.detector_time = 0.0; self.total_time = 0.0; self.last_pass_time = 0.0
+
+    def load(self):
+        # Carga los perfiles de langdetect (~0,5 s); se llama desde el hilo de OCR al arrancar
+        with self.lock:
+            if self.factory is not None: return self.factory
+            from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+            factory = DetectorFactory(); factory.load_profile(PROFILES_DIRECTORY); factory.set_seed(LANGUAGE_SEED)
+            self.prior_map = {lang: (1.0 if lang in self.languages else LANGUAGE_OTHER_PRIOR) for lang in factory.get_lang_list()}
+            self.factory = factory
+            return factory
+
+    def fast_detect(self, text):
+        # Devuelve (decidido, idioma). Sin letras: (True, None).
+        words = WORD_PATTERN.findall(text.lower())
+        if not words: return True, None
+        scores = []
+        for lang in self.languages:
+            vocabulary = LANGUAGE_WORDS.get(lang, ()); chars = LANGUAGE_CHARS.get(lang, ())
+            score = sum(1 for w in words if w in vocabulary)
+            if chars: score += sum(1 for c in text.lower() if c in chars)
+            scores.append((score, lang))
+        scores.sort(reverse=True)
+        best, lang = scores[0]; runner_up = scores[1][0] if len(scores) > 1 else 0
+        if best >= max(1.0, LANGUAGE_FAST_COVERAGE * len(words)) and best >= LANGUAGE_FAST_MARGIN * runner_up:
+            return True, lang
+        return False, None
+
+    def detect_with_langdetect(self, text):
+        from langdetect import LangDetectException
+        detector = self.load().create()
+        detector.set_prior_map(self.prior_map); detector.append(text)
+        try: return detector.detect()
+        except LangDetectException: return None
+
+    def detect_batch(self, texts, check=None):
+        # {texto: idioma o None}. Los textos repetidos se resuelven una sola vez; `check` se
+        # llama entre textos enviados a langdetect para poder cancelar la pasada.
+        start = time.perf_counter()
+        results = {}; pending = {}; memo_hits = 0; fast = 0
+        for text in texts:
+            if text in results or text in pending: continue
+            key = normalize_text(text); cached = self.memo.get(key)
+            if cached is not None: results[text] = cached or None; memo_hits += 1; continue
+            decided, lang = self.fast_detect(key)
+            if decided: results[text] = lang; self.memo.put(key, lang or LANGUAGE_UNKNOWN); fast += 1
+            else: pending[text] = key
+        detector_start = time.perf_counter()
+        for text, key in pending.items():
+            if check: check()
+            lang = self.detect_with_langdetect(key)
+            results[text] = lang; self.memo.put(key, lang or LANGUAGE_UNKNOWN)
+        end = time.perf_counter()
+        with self.lock:
+            self.passes += 1; self.lines += len(texts); self.memo_hits += memo_hits; self.fast_path += fast
+            self.detector_calls += len(pending); self.detector_time += end - detector_start
+            self.total_time += end - start; self.last_pass_time = end - start
+        return results
+
+    def detect(self, text):
+        return self.detect_batch([text])[text]
+
+    def stats(self):
+        with self.lock:
+            return {'passes': self.passes, 'lines': self.lines, 'memo_hits': self.memo_hits, 'fast_path': self.fast_path,
+                    'detector_calls': self.detector_calls, 'detector_ms': round(self.detector_time * 1000, 1),
+                    'ms_per_pass': round(self.total_time * 1000 / self.passes, 2) if self.passes else None,
+                    'last_pass_ms': round(self.last_pass_time * 1000, 2)}
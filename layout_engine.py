@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+
+# --- CONFIGURACIÓN (tolerancias en múltiplos de la altura del texto) ---
+LAYOUT_MIN_CONFIDENCE = 0.3   # Fragmentos de OCR por debajo de esta confianza se descartan
+LAYOUT_ROW_TOLERANCE = 0.5    # Diferencia máxima entre centros verticales de una misma fila
+LAYOUT_WORD_GAP = 1.5         # Hueco horizontal máximo entre fragmentos de una línea
+LAYOUT_HEIGHT_RATIO = 1.4     # Relación máxima de alturas para unir fragmentos o líneas
+LAYOUT_PARAGRAPH_GAP = 0.8    # Interlineado máximo entre dos líneas de un mismo párrafo
+LAYOUT_ALIGN_TOLERANCE = 1.0  # Desalineación máxima (borde izquierdo o centro) entre líneas de un párrafo
+LAYOUT_MIN_WRAP_WIDTH = 8.0   # Ancho mínimo de una línea para continuar en la siguiente (evita unir menús)
+LAYOUT_WRAP_FILL = 0.6        # La línea de arriba debe ocupar al menos esta fracción de la de abajo
+LAYOUT_MAX_CANDIDATES = 128   # Vecinos examinados como máximo por cada fragmento o línea
+LAYOUT_MAX_UNIT_CHARS = 1500  # Un párrafo más largo se corta en varias unidades de traducción
+
+def fragment_arrays(fragments):
+    # Rectángulo envolvente de cada bbox de EasyOCR (4 puntos) como arrays de columnas
+    # (aplanar a una lista de números antes de crear el array es bastante más rápido)
+    points = np.array([c for f in fragments for p in f[0] for c in p], dtype=np.float64).reshape(len(fragments), -1, 2)
+    x0 = points[:, :, 0].min(axis=1); x1 = points[:, :, 0].max(axis=1)
+    y0 = points[:, :, 1].min(axis=1); y1 = points[:, :, 1].max(axis=1)
+    return x0, x1, y0, y1
+
+def join_text(parts):
+    # Une líneas envueltas: una palabra cortada con guion al final de línea se vuelve a juntar
+    text = parts[0]
+    for part in parts[1:]:
+        if text.endswith('-') and len(text) > 1 and text[-2].isalpha() and part[:1].islower(): text = text[:-1] + part
+        else: text = text + " " + part
+    return text
+
+def window_pairs(values, low, high, max_candidates=LAYOUT_MAX_CANDIDATES):
+    # Pares (a, b), a != b, con low[a] <= values[b] <= high[a]; `values` debe estar ordenado.
+    # Cada elemento solo se compara con su ventana, así que el coste crece casi linealmente.
+    lo = np.searchsorted(values, low, side='left'); hi = np.searchsorted(values, high, side='right')
+    counts = np.clip(hi - lo, 0, max_candidates); total = int(counts.sum())
+    if not total: return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    a = np.repeat(np.arange(len(values)), counts)
+    b = np.repeat(lo, counts) + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    keep = a != b
+    return a[keep], b[keep]
+
+def best_links(count, a, b, cost):
+    # next_item[i] = sucesor de i (-1 si ninguno). Cada elemento se une como mucho con un
+    # sucesor y recibe como mucho un predecesor: el de menor coste.
+    next_item = np.full(count, -1)
+    if not len(a): return next_item
+    order = np.lexsort((cost, a)); first = np.unique(a[order], return_index=True)[1]
+    a = a[order][first]; b = b[order][first]; cost = cost[order][first]
+    order = np.lexsort((cost, b)); first = np.unique(b[order], return_index=True)[1]
+    next_item[a[order][first]] = b[order][first]
+    return next_item
+
+def chains(next_item):
+    # Recorre las cadenas de enlaces desde cada elemento sin predecesor
+    next_list = next_item.tolist()
+    has_prev = np.zeros(len(next_list), dtype=bool); has_prev[next_item[next_item >= 0]] = True
+    for start in np.flatnonzero(~has_prev).tolist():
+        members = [start]; i = next_list[start]
+        while i >= 0: members.append(i); i = next_list[i]
+        yield members
+
+# -----------------------------------------------------------------------------
+# FRAGMENTOS -> LÍNEAS
+# -----------------------------------------------------------------------------
+def group_lines(fragments, min_confidence=LAYOUT_MIN_CONFIDENCE):
+    # Devuelve (x0, x1, y0, y1, textos) con una entrada por línea. Cada fragmento se enlaza
+    # con el más cercano a su derecha en la misma fila (centros verticales próximos); un hueco
+    # grande entre fragmentos separa columnas.
+    fragments = [f for f in fragments if f[2] > min_confidence and f[1].strip()]
+    if not fragments: return None
+    x0, x1, y0, y1 = fragment_arrays(fragments)
+    order = np.argsort((y0 + y1) / 2, kind='stable')
+    x0 = x0[order]; x1 = x1[order]; y0 = y0[order]; y1 = y1[order]
+    h = np.maximum(y1 - y0, 1.0); cy = (y0 + y1) / 2
+
+    a, b = window_pairs(cy, cy - LAYOUT_ROW_TOLERANCE * h, cy + LAYOUT_ROW_TOLERANCE * h)
+    hp = np.maximum(h[a], h[b]); hn = np.minimum(h[a], h[b]); gap = x0[b] - x1[a]
+    ok = ((np.abs(cy[b] - cy[a]) <= LAYOUT_ROW_TOLERANCE * hn) & (gap <= LAYOUT_WORD_GAP * hp) & (gap >= -0.5 * hp) &
+          ((x0[b] > x0[a]) | ((x0[b] == x0[a]) & (b > a))) & (hp <= LAYOUT_HEIGHT_RATIO * hn))
+    next_item = best_links(len(x0), a[ok], b[ok], gap[ok])
+
+    texts = [fragments[i][1].strip() for i in order.tolist()]
+    members = list(chains(next_item))
+    idx = np.fromiter((i for m in members for i in m), dtype=np.intp, count=len(x0))
+    starts = np.cumsum([0] + [len(m) for m in members[:-1]])
+    line_texts = [" ".join(texts[i] for i in m) for m in members]
+    return (np.minimum.reduceat(x0[idx], starts), np.maximum.reduceat(x1[idx], starts),
+            np.minimum.reduceat(y0[idx], starts), np.maximum.reduceat(y1[idx], starts), line_texts)
+
+# -----------------------------------------------------------------------------
+# LÍNEAS -> PÁRRAFOS
+# -----------------------------------------------------------------------------
+def link_lines(x0, x1, y0, y1):
+    # next_line[i] = línea que continúa a la línea i en el mismo párrafo (-1 si ninguna).
+    # Las líneas deben llegar ordenadas por y0; solo se comparan con las que empiezan justo debajo.
+    h = np.maximum(y1 - y0, 1.0)
+    a, b = window_pairs(y0, y1 - 0.25 * h, y1 + LAYOUT_PARAGRAPH_GAP * h)
+    hm = (h[a] + h[b]) / 2; vgap = y0[b] - y1[a]
+    wa = x1[a] - x0[a]; wb = x1[b] - x0[b]
+    aligned = ((np.abs(x0[a] - x0[b]) <= LAYOUT_ALIGN_TOLERANCE * hm) |
+               (np.abs((x0[a] + x1[a]) - (x0[b] + x1[b])) / 2 <= LAYOUT_ALIGN_TOLERANCE * hm))
+    ok = ((b > a) & (vgap >= -0.25 * hm) & (vgap <= LAYOUT_PARAGRAPH_GAP * hm) & aligned &
+          (np.maximum(h[a], h[b]) <= LAYOUT_HEIGHT_RATIO * np.minimum(h[a], h[b])) &
+          (wa >= LAYOUT_MIN_WRAP_WIDTH * h[a]) & (wa >= LAYOUT_WRAP_FILL * wb))
+    return best_links(len(x0), a[ok], b[ok], vgap[ok])
+
+def group_paragraphs(fragments, min_confidence=LAYOUT_MIN_CONFIDENCE):
+    # Sustituye a la agrupación por líneas: devuelve unidades de traducción
+    # [{'bbox': [[x0, y0], [x1, y0], [x1, y1], [x0, y1]], 'text': str, 'lines': int}]
+    # ordenadas de arriba abajo y de izquierda a derecha.
+    lines = group_lines(fragments, min_confidence)
+    if lines is None: return []
+    x0, x1, y0, y1, texts = lines
+    order = np.lexsort((x0, y0))
+    x0 = x0[order]; x1 = x1[order]; y0 = y0[order]; y1 = y1[order]; texts = [texts[i] for i in order.tolist()]
+    next_line = link_lines(x0, x1, y0, y1)
+
+    units = []; x0 = x0.tolist(); x1 = x1.tolist(); y0 = y0.tolist(); y1 = y1.tolist()
+    def emit(members):
+        text = join_text([texts[i] for i in members]).strip()
+        if len(text) < 2 or text.isdigit(): return
+        ux0 = int(min(x0[i] for i in members)); ux1 = math.ceil(max(x1[i] for i in members))
+        uy0 = int(min(y0[i] for i in members)); uy1 = math.ceil(max(y1[i] for i in members))
+        units.append({'bbox': [[ux0, uy0], [ux1, uy0], [ux1, uy1], [ux0, uy1]], 'text': text, 'lines': len(members)})
+
+    for chain in chains(next_line):
+        members = []; chars = 0
+        for i in chain:
+            if members and chars + len(texts[i]) > LAYOUT_MAX_UNIT_CHARS: emit(members); members = []; chars = 0
+            members.append(i); chars += len(texts[i]) + 1
+        emit(members)
+    units.sort(key=lambda u: (u['bbox'][0][1], u['bbox'][0][0]))
+    return units
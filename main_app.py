@@ -1,26 +1,44 @@
 import sys
+import time
+# Referencia para medir el arranque (tiempo hasta la primera ventana / primera traducción)
+APP_START_TIME = time.perf_counter()
 import threading
-from concurrent.futures import ThreadPoolExecutor
-from PyQt6.QtWidgets import (QApplication, QWidget, QLabel, QPushButton, 
-                             QHBoxLayout, QStyle, QFrame, QGraphicsDropShadowEffect)
+from PyQt6.QtWidgets import (QApplication, QWidget, QPushButton, 
+                             QHBoxLayout, QStyle, QFrame, QGraphicsDropShadowEffect, QMenu)
 from PyQt6.QtCore import Qt, pyqtSignal, QRect, QTimer
-from PyQt6.QtGui import QPainter, QPen, QColor, QBrush, QGuiApplication
+from PyQt6.QtGui import QPainter, QPen, QColor, QBrush, QGuiApplication, QActionGroup
 from pynput import mouse
-import mss
-import easyocr
 import numpy as np
-import cv2
-from deep_translator import GoogleTranslator
-from langdetect import detect, LangDetectException
+from ocr_worker import OcrWorker
+from capture import OverlayEraser, exclude_window_from_capture
+from translation_layer import TranslationLayer
+from pipeline import TranslationPipeline
+from tracing import Tracer
+from performance_hud import PerformanceHud
+from ocr_reader import create_reader, describe_reader
+from translation_backends import TRANSLATION_BACKEND, BACKEND_LABELS
 
 # --- CONFIGURACIÓN ---
 CAPTURE_WIDTH = 500
 CAPTURE_HEIGHT = 300
 MOUSE_IDLE_TIME = 0.7
-LINE_TOLERANCE = 10
-HORIZONTAL_TOLERANCE_PIXELS = 30
 RECT_REFRESH_INTERVAL = 2000 # 2 segundos
 
+# --- CARGA DIFERIDA: easyocr/torch, cv2, requests y langdetect se importan fuera del arranque ---
+def load_ocr_reader(language_id=None):
+    # Se ejecuta en el hilo de OCR: importa los módulos pesados, crea el lector y hace
+    # una inferencia de prueba para que el primer trabajo real no pague la inicialización.
+    print(f"Cargando modelo de EasyOCR ({describe_reader()})...")
+    import cv2
+    import requests
+    if language_id: language_id.load()
+    reader = create_reader()
+    warmup_img = np.full((48, 200), 255, dtype=np.uint8)
+    cv2.putText(warmup_img, "Hello", (10, 36), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+    reader.readtext(warmup_img)
+    print(f"¡Modelo cargado! ({time.perf_counter() - APP_START_TIME:.2f} s desde el inicio)")
+    return reader
+
 # -----------------------------------------------------------------------------
 # CLASE 1: APLICACIÓN PRINCIPAL (OVERLAY)
 # -----------------------------------------------------------------------------
@@ -38,14 +56,22 @@ class MainApp(QWidget):
         self.mouse_listener = None
         self.mouse_controller = mouse.Controller()
 
-        print("Cargando modelo de EasyOCR (en/es)...")
-        self.reader = easyocr.Reader(['en', 'es'], gpu=False)
-        print("¡Modelo cargado!")
-        self.translator = GoogleTranslator(source='auto', target='es')
-        
+        self.startup_times = {}
+        # Traducciones visibles (clave -> datos) y capa que las pinta en un único paintEvent
         self.active_translations = {}
+        self.translation_layer = TranslationLayer(self)
+        # Captura, OCR, disposición, idioma y traducción viven en el pipeline (sin Qt); los
+        # resultados llegan a la ventana por las señales de etiquetas
+        # Trazas por etapa (desactivadas hasta abrir el HUD: span() no mide nada) y su HUD
+        self.tracer = Tracer(); self.performance_hud = PerformanceHud(self.tracer)
+        self.pipeline = TranslationPipeline(self, backend_name=TRANSLATION_BACKEND, tracer=self.tracer)
+        # Un único hilo de OCR posee el lector y lo carga en segundo plano; los trabajos
+        # nuevos reemplazan a los pendientes y esperan en cola hasta que el modelo está listo
+        self.ocr_worker = OcrWorker(lambda: load_ocr_reader(self.pipeline.language_id)); self.ocr_worker.start()
         self.ocr_timer = None
         self.screen_scale_factor = QGuiApplication.primaryScreen().devicePixelRatio()
+        # El overlay cubre el escritorio virtual completo (todos los monitores)
+        self.desktop_geometry = QGuiApplication.primaryScreen().virtualGeometry()
         
         self.fullscreen_timer = QTimer(self); self.fullscreen_timer.setSingleShot(True)
         self.fullscreen_timer.timeout.connect(self.perform_fullscreen_ocr)
@@ -55,14 +81,28 @@ class MainApp(QWidget):
 
         self.initUI()
         self.set_mode("pointer")
+        QTimer.singleShot(0, lambda: self.report_startup_time("first_window", "Primera ventana visible"))
+
+    def report_startup_time(self, key, description):
+        if key in self.startup_times: return
+        self.startup_times[key] = time.perf_counter() - APP_START_TIME
+        print(f"{description}: {self.startup_times[key]:.2f} s desde el inicio")
 
     def initUI(self):
         self.setWindowFlag(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.showFullScreen()
+        self.setGeometry(self.desktop_geometry); self.show()
+        # Las capturas no deben ver nuestras propias etiquetas (mss incluye las ventanas superpuestas):
+        # se excluye el overlay de la captura y, si el sistema no lo permite, se borran de cada captura
+        if not exclude_window_from_capture(int(self.winId())):
+            print("El overlay no se puede excluir de las capturas: se borrarán sus etiquetas de cada captura")
+            self.pipeline.overlay_eraser = OverlayEraser(self.overlay_rects)
+        exclude_window_from_capture(int(self.performance_hud.winId()))
         self.add_label_signal.connect(self.add_label_slot)
         self.remove_label_signal.connect(self.remove_label_slot)
-        self.clear_all_labels_signal.connect(self.clear_all_labels_slot)
+        # El borrado también va por la cola de eventos: las etiquetas que un trabajo cancelado emitió
+        # antes de cancel_all() ya están en cola y se aplican antes de él, nunca después
+        self.clear_all_labels_signal.connect(self.clear_all_labels_slot, Qt.ConnectionType.QueuedConnection)
         self.setMouseTracking(True)
 
     def set_mode(self, mode):
@@ -74,6 +114,7 @@ class MainApp(QWidget):
 
         if self.ocr_timer: self.ocr_timer.cancel()
         self.fullscreen_timer.stop(); self.rect_refresh_timer.stop()
+        self.ocr_worker.cancel_all()
         
         if not (previous_mode == "rect_select" and mode == "pointer"):
             self.completed_selection_rect = QRect()
@@ -111,6 +152,7 @@ class MainApp(QWidget):
             self.is_selecting = False
             if self.selection_rect.width() > 10 and self.selection_rect.height() > 10:
                 self.completed_selection_rect = self.selection_rect.normalized()
+                self.pipeline.reset_selection()
                 self.set_mode("pointer"); self.trigger_periodic_selection_ocr()
             else:
                 self.set_mode("pointer")
@@ -129,77 +171,21 @@ class MainApp(QWidget):
                 painter.setPen(pen); painter.drawRect(rect_to_draw)
         elif self.current_mode == "pointer" and self.completed_selection_rect.isValid():
             pen = QPen(QColor(80, 220, 100), 2, Qt.PenStyle.DashLine); painter.setPen(pen); painter.drawRect(self.completed_selection_rect)
+        with self.tracer.span('paint', self.trace_mode()): self.translation_layer.paint(painter, event.region())
 
     def trigger_periodic_selection_ocr(self):
         if not self.completed_selection_rect.isValid(): self.rect_refresh_timer.stop(); return
-        threading.Thread(target=self.perform_ocr_on_selection, daemon=True).start()
-    
-    def perform_ocr_on_selection(self):
-        try:
-            rect = self.completed_selection_rect
-            bbox = {'top': int(rect.y() * self.screen_scale_factor), 'left': int(rect.x() * self.screen_scale_factor),
-                    'width': int(rect.width() * self.screen_scale_factor), 'height': int(rect.height() * self.screen_scale_factor)}
-            # --- CORRECCIÓN CRÍTICA: El origen debe estar en píxeles físicos ---
-            origin = (bbox['left'], bbox['top'])
-            self.run_ocr_and_update(bbox, origin, is_periodic=True)
-        except Exception as e: print(f"Error en hilo de OCR de selección: {e}")
+        rect = self.completed_selection_rect.translated(self.desktop_geometry.topLeft())
+        bbox = {'top': int(rect.y() * self.screen_scale_factor), 'left': int(rect.x() * self.screen_scale_factor),
+                'width': int(rect.width() * self.screen_scale_factor), 'height': int(rect.height() * self.screen_scale_factor)}
+        # --- CORRECCIÓN CRÍTICA: El origen debe estar en píxeles físicos ---
+        origin = (bbox['left'], bbox['top'])
+        # Si el refresco anterior aún no terminó, se deja acabar y este queda en espera
+        self.ocr_worker.submit(self.pipeline.run_ocr_and_update, bbox, origin, kind="periodic_rect", supersede_running=False)
         
     def perform_fullscreen_ocr(self):
         print("\n--- Iniciando OCR de pantalla completa ---")
-        try:
-            with mss.mss() as sct:
-                monitor = sct.monitors[1]
-                origin = (monitor['left'], monitor['top'])
-                threading.Thread(target=self.run_ocr_and_update, args=(monitor, origin, False), daemon=True).start()
-        except Exception as e: print(f"Error en OCR de pantalla completa: {e}")
-
-    # --- CAMBIO CRÍTICO: Lógica de traducción paralela ---
-    def run_ocr_and_update(self, bounding_box, selection_origin_physical, is_periodic):
-        if not is_periodic: self.clear_all_labels_signal.emit()
-        
-        new_results = {}
-        with mss.mss() as sct:
-            sct_img = sct.grab(bounding_box)
-            img_np = np.array(sct_img); img_gray = cv2.cvtColor(img_np, cv2.COLOR_BGRA2GRAY)
-            raw_results = self.reader.readtext(img_gray, width_ths=0.6, text_threshold=0.6, low_text=0.4)
-            grouped_lines = self.group_text_fragments_by_line(raw_results)
-            
-            items_to_translate = []
-            for line in grouped_lines:
-                text, bbox_coords = line['text'], line['bbox']
-                try:
-                    detected_lang = detect(text)
-                    if detected_lang != 'es': items_to_translate.append(line)
-                except (LangDetectException, TypeError): continue
-            
-            # Función que traduce un solo item
-            def translate_item(item):
-                try:
-                    translated_text = self.translator.translate(item['text'])
-                    if translated_text and translated_text.lower() != item['text'].lower():
-                        return item['text'], {'translated': translated_text, 'bbox': item['bbox'], 'selection_origin': selection_origin_physical}
-                except Exception: return None
-                return None
-
-            # Usamos un ThreadPool para traducir todo en paralelo y mostrarlo a medida que llega
-            with ThreadPoolExecutor() as executor:
-                # En modo periódico, actualizamos al final para evitar parpadeo
-                if is_periodic:
-                    future_results = [executor.submit(translate_item, item) for item in items_to_translate]
-                    for future in future_results:
-                        result = future.result()
-                        if result: new_results[result[0]] = result[1]
-                    self.update_active_translations(new_results)
-                # En modo "1 por 1", actualizamos en cuanto llega el resultado
-                else:
-                    for item in items_to_translate:
-                        future = executor.submit(translate_item, item)
-                        future.add_done_callback(lambda fut: self.add_label_signal.emit(fut.result()[0], fut.result()[1]) if fut.result() else None)
-
-    def update_active_translations(self, new_results):
-        old_keys = set(self.active_translations.keys()); new_keys = set(new_results.keys())
-        for key in old_keys - new_keys: self.remove_label_signal.emit(key)
-        for key in new_keys - old_keys: self.add_label_signal.emit(key, new_results[key])
+        self.ocr_worker.submit(self.pipeline.run_fullscreen_ocr, kind="fullscreen")
 
     def start_pointer_listener(self):
         if not self.mouse_listener: self.mouse_listener = mouse.Listener(on_move=self.on_pointer_move); self.mouse_listener.start()
@@ -211,7 +197,9 @@ class MainApp(QWidget):
     def on_pointer_move(self, x, y):
         if self.current_mode != "pointer" or self.rect_refresh_timer.isActive(): return
         if self.ocr_timer: self.ocr_timer.cancel()
-        self.clear_all_labels_signal.emit()
+        # El ratón se movió: los trabajos de puntero en curso ya no deben mostrar nada. Las
+        # etiquetas visibles se mantienen; la siguiente pasada quita solo las que ya no valen.
+        self.ocr_worker.cancel_all()
         self.ocr_timer = threading.Timer(MOUSE_IDLE_TIME, self.perform_ocr_pointer); self.ocr_timer.start()
 
     def perform_ocr_pointer(self):
@@ -220,65 +208,68 @@ class MainApp(QWidget):
             pos_x, pos_y = self.mouse_controller.position
             bbox = {'top': int(pos_y - CAPTURE_HEIGHT / 2), 'left': int(pos_x - CAPTURE_WIDTH / 2), 'width': CAPTURE_WIDTH, 'height': CAPTURE_HEIGHT}
             origin = (bbox['left'], bbox['top'])
-            self.run_ocr_and_update(bbox, origin, is_periodic=False)
+            self.ocr_worker.submit(self.pipeline.run_pointer_ocr, bbox, origin, kind="pointer")
         except Exception as e: print(f"Error en OCR puntero: {e}")
-        
-    def group_text_fragments_by_line(self, fragments):
-        if not fragments: return []
-        fragments = [f for f in fragments if f[2] > 0.3]; fragments.sort(key=lambda f: (f[0][0][1], f[0][0][0]))
-        if not fragments: return []
-        lines = []; current_line = [fragments[0]]
-        for i in range(1, len(fragments)):
-            prev_box = current_line[-1][0]; curr_box = fragments[i][0]
-            y_diff = abs(curr_box[0][1] - prev_box[0][1]); x_gap = curr_box[0][0] - prev_box[1][0]
-            if y_diff < LINE_TOLERANCE and 0 < x_gap < HORIZONTAL_TOLERANCE_PIXELS: current_line.append(fragments[i])
-            else: lines.append(current_line); current_line = [fragments[i]]
-        lines.append(current_line)
-        processed_lines = []
-        for line_fragments in lines:
-            full_text = " ".join([f[1] for f in line_fragments])
-            if len(full_text.strip()) < 2 or full_text.strip().isdigit(): continue
-            min_x = line_fragments[0][0][0][0]; max_x = line_fragments[-1][0][1][0]
-            min_y = min(f[0][0][1] for f in line_fragments); max_y = max(f[0][2][1] for f in line_fragments)
-            full_bbox = [[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y]]
-            processed_lines.append({'bbox': full_bbox, 'text': full_text})
-        return processed_lines
 
     # --- CAMBIO CRÍTICO: Lógica de tamaño flexible ---
-    def create_compact_translation_label(self, text, bbox, selection_origin_physical):
-        label = QLabel(text, self); label.setAlignment(Qt.AlignmentFlag.AlignCenter); label.setWordWrap(True)
-        label.setStyleSheet("""QLabel{background-color:rgb(40,40,40);color:#F0F0F0;border:1px solid rgba(255,255,255,60);border-radius:3px;padding:3px 5px;font-family:'Segoe UI',Arial,sans-serif;font-size:13px;font-weight:500}""")
+    def label_geometry(self, bbox, selection_origin_physical):
         top_left = bbox[0]; bottom_right = bbox[2]
         
-        final_x = (selection_origin_physical[0] + top_left[0]) / self.screen_scale_factor
-        final_y = (selection_origin_physical[1] + top_left[1]) / self.screen_scale_factor
+        final_x = (selection_origin_physical[0] + top_left[0]) / self.screen_scale_factor - self.desktop_geometry.x()
+        final_y = (selection_origin_physical[1] + top_left[1]) / self.screen_scale_factor - self.desktop_geometry.y()
         final_w = (bottom_right[0] - top_left[0]) / self.screen_scale_factor
-        
-        # El ancho es fijo, pero la altura es flexible
-        label.setMaximumWidth(int(final_w))
-        label.adjustSize() # Ajusta la altura al contenido
-        label.move(int(final_x), int(final_y))
-        label.show()
-        return label
-
-    def add_label_slot(self, original_text, data):
-        if original_text in self.active_translations: return
-        new_label = self.create_compact_translation_label(data['translated'], data['bbox'], data['selection_origin'])
-        self.active_translations[original_text] = new_label
-
-    def remove_label_slot(self, original_text):
-        if original_text in self.active_translations:
-            label = self.active_translations.pop(original_text); label.deleteLater()
+        # El ancho es fijo, pero la altura es flexible (la calcula la capa de traducciones)
+        return final_x, final_y, final_w
+
+    def set_translation_backend(self, name):
+        if name == self.pipeline.backend_name: return
+        print(f"Backend de traducción: {BACKEND_LABELS[name]}")
+        # Lo que está en pantalla es del backend anterior: se quita y se vuelve a traducir en el modo actual
+        self.ocr_worker.cancel_all(); self.pipeline.set_backend(name); self.clear_all_labels_signal.emit()
+        if self.rect_refresh_timer.isActive(): self.trigger_periodic_selection_ocr()
+        elif self.current_mode == "fullscreen": self.fullscreen_timer.start(250)
+
+    def overlay_rects(self):
+        # Se llama desde el hilo de OCR: tuple() copia los valores del diccionario sin soltar el GIL
+        items = tuple(self.translation_layer.items.values())
+        s = self.screen_scale_factor; dx = self.desktop_geometry.x(); dy = self.desktop_geometry.y()
+        return [((r.left() + dx) * s, (r.top() + dy) * s, (r.right() + 1 + dx) * s, (r.bottom() + 1 + dy) * s)
+                for r in (item.rect for item in items)]
+
+    # Las señales no llevan el trabajo de origen: el modo de las trazas de UI sale del estado actual
+    def trace_mode(self):
+        return "periodic_rect" if self.rect_refresh_timer.isActive() else self.current_mode
+
+    def set_performance_hud(self, visible):
+        self.tracer.enabled = visible
+        if visible: self.tracer.clear(); self.performance_hud.show(); return
+        self.performance_hud.hide()
+        print(f"Traza exportada (chrome://tracing): {self.tracer.export_chrome_trace()}")
+
+    # Los slots aplican cambios mínimos sobre la capa: añadir, mover, cambiar texto o quitar
+    def add_label_slot(self, key, data):
+        with self.tracer.span('label_add', self.trace_mode()):
+            x, y, w = self.label_geometry(data['bbox'], data['selection_origin'])
+            self.active_translations[key] = data
+            self.translation_layer.set_item(key, data['translated'], x, y, w)
+        self.report_startup_time("first_translation", "Primera traducción en pantalla")
+
+    def remove_label_slot(self, key):
+        with self.tracer.span('label_remove', self.trace_mode()): self.active_translations.pop(key, None); self.translation_layer.remove_item(key)
 
     def clear_all_labels_slot(self):
-        for key in list(self.active_translations.keys()):
-            label = self.active_translations.pop(key); label.deleteLater()
+        with self.tracer.span('label_clear', self.trace_mode()): self.active_translations.clear(); self.translation_layer.clear()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Escape: self.close()
 
     def closeEvent(self, event):
         print("Cerrando aplicación..."); self.stop_pointer_listener()
+        print(f"Trabajos de OCR: {self.ocr_worker.stats()}"); print(f"Capa de traducciones: {self.translation_layer.stats()}")
+        self.ocr_worker.stop()
+        for name, stats in self.pipeline.stats().items(): print(f"Pipeline / {name}: {stats}")
+        self.pipeline.close()
+        if self.tracer.enabled: self.set_performance_hud(False)
         self.fullscreen_timer.stop(); self.rect_refresh_timer.stop()
         if self.ocr_timer: self.ocr_timer.cancel()
         if hasattr(self, 'toolbar'): self.toolbar.close()
@@ -290,6 +281,8 @@ class MainApp(QWidget):
 class Toolbar(QWidget):
     mode_changed = pyqtSignal(str)
     clear_labels_signal = pyqtSignal()
+    hud_toggled = pyqtSignal(bool)
+    backend_changed = pyqtSignal(str)
     
     def __init__(self):
         super().__init__(); self.setWindowTitle("Traductor"); self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
@@ -300,13 +293,18 @@ class Toolbar(QWidget):
         self.btn_fullscreen = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_DesktopIcon), ""); self.btn_fullscreen.setToolTip("Traducir Pantalla Completa"); self.btn_fullscreen.clicked.connect(lambda: self.set_active_mode("fullscreen", self.btn_fullscreen)); layout.addWidget(self.btn_fullscreen)
         self.btn_rect_select = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogDetailedView), ""); self.btn_rect_select.setToolTip("Seleccionar Área Rectangular"); self.btn_rect_select.clicked.connect(lambda: self.set_active_mode("rect_select", self.btn_rect_select)); layout.addWidget(self.btn_rect_select)
         separator = QFrame(); separator.setFrameShape(QFrame.Shape.VLine); separator.setFrameShadow(QFrame.Shadow.Sunken); layout.addWidget(separator)
-        self.btn_settings = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogInfoView), ""); self.btn_settings.setToolTip("Configurar Idiomas"); self.btn_settings.clicked.connect(self.on_settings_clicked); layout.addWidget(self.btn_settings)
+        self.btn_hud = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogContentsView), ""); self.btn_hud.setToolTip("HUD de rendimiento (al cerrarlo se exporta la traza)"); self.btn_hud.setCheckable(True); self.btn_hud.toggled.connect(self.hud_toggled.emit); layout.addWidget(self.btn_hud)
+        self.btn_settings = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogInfoView), ""); self.btn_settings.setToolTip("Backend de traducción"); self.btn_settings.clicked.connect(self.on_settings_clicked); layout.addWidget(self.btn_settings)
         self.btn_collapse = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarShadeButton), ""); self.btn_collapse.setToolTip("Minimizar barra de herramientas"); self.btn_collapse.clicked.connect(self.toggle_minimize); layout.addWidget(self.btn_collapse)
         self.btn_trash = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_TrashIcon), ""); self.btn_trash.setToolTip("Limpiar traducciones actuales"); self.btn_trash.clicked.connect(self.on_trash_clicked); layout.addWidget(self.btn_trash)
         self.minimized_widget = QWidget(); min_layout = QHBoxLayout(self.minimized_widget)
         self.btn_expand = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowLeft), ""); self.btn_expand.setToolTip("Expandir barra de herramientas"); self.btn_expand.clicked.connect(self.toggle_minimize); min_layout.addWidget(self.btn_expand)
         self.main_layout.addWidget(self.expanded_widget); self.main_layout.addWidget(self.minimized_widget); self.minimized_widget.hide()
-        self.setStyleSheet("""QWidget{background-color:#2E2E2E;border-radius:8px}QPushButton{background-color:#4A4A4A;border:1px solid #6E6E6E;padding:5px;border-radius:5px;min-width:28px;min-height:28px}QPushButton:hover{background-color:#5A5A5A}QPushButton:pressed{background-color:#6A6A6A}QPushButton[active="true"]{background-color:#0078D7;border:2px solid #40A0FF}QFrame{border:1px solid #4A4A4A}""")
+        self.setStyleSheet("""QWidget{background-color:#2E2E2E;border-radius:8px}QPushButton{background-color:#4A4A4A;border:1px solid #6E6E6E;padding:5px;border-radius:5px;min-width:28px;min-height:28px}QPushButton:hover{background-color:#5A5A5A}QPushButton:pressed{background-color:#6A6A6A}QPushButton:checked{background-color:#0078D7;border:2px solid #40A0FF}QPushButton[active="true"]{background-color:#0078D7;border:2px solid #40A0FF}QFrame{border:1px solid #4A4A4A}""")
+        self.settings_menu = QMenu(self); self.backend_actions = QActionGroup(self)
+        for name, label in BACKEND_LABELS.items():
+            action = self.settings_menu.addAction(label); action.setCheckable(True); action.setChecked(name == TRANSLATION_BACKEND)
+            action.triggered.connect(lambda checked, n=name: self.backend_changed.emit(n)); self.backend_actions.addAction(action)
         self.set_active_mode("pointer", self.btn_pointer)
 
     def toggle_minimize(self):
@@ -318,7 +316,7 @@ class Toolbar(QWidget):
         button_widget.setProperty("active", "true"); button_widget.style().unpolish(button_widget); button_widget.style().polish(button_widget)
         self.active_button = button_widget; self.mode_changed.emit(mode_name)
 
-    def on_settings_clicked(self): print("Acción: Abrir Configuración")
+    def on_settings_clicked(self): self.settings_menu.popup(self.btn_settings.mapToGlobal(self.btn_settings.rect().bottomLeft()))
     def on_trash_clicked(self): self.clear_labels_signal.emit()
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton: self.drag_pos = event.globalPosition().toPoint() - self.frameGeometry().topLeft(); event.accept()
@@ -335,5 +333,7 @@ if __name__ == '__main__':
     overlay.toolbar = toolbar
     toolbar.mode_changed.connect(overlay.set_mode)
     toolbar.clear_labels_signal.connect(overlay.clear_all_labels_slot)
+    toolbar.hud_toggled.connect(overlay.set_performance_hud)
+    toolbar.backend_changed.connect(overlay.set_translation_backend)
     overlay.show(); toolbar.show(); toolbar.setFixedSize(toolbar.sizeHint())
     sys.exit(app.exec())
\ No newline at end of file
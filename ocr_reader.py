@@ -0,0 +1,22 @@
+# --- CONFIGURACIÓN DEL LECTOR DE EASYOCR (CPU) ---
+OCR_LANGUAGES = ('en', 'es')  # ('en',) carga el reconocedor inglés, más pequeño que el latino de en+es
+OCR_QUANTIZE = True           # int8 dinámico en las capas Linear/LSTM del reconocedor; False = fp32
+OCR_TORCH_THREADS = None      # Hilos de torch por proceso; None = los que decida torch
+
+# -----------------------------------------------------------------------------
+# FÁBRICA DEL LECTOR
+# -----------------------------------------------------------------------------
+def create_reader(languages=OCR_LANGUAGES, quantize=OCR_QUANTIZE, torch_threads=OCR_TORCH_THREADS, verbose=False):
+    # La cuantización dinámica de torch solo convierte capas Linear/LSTM: el detector CRAFT
+    # (todo convoluciones) sigue en fp32 aunque se pida, y la ganancia está en el reconocedor.
+    import torch
+    import easyocr
+    if torch_threads: torch.set_num_threads(torch_threads)
+    reader = easyocr.Reader(list(languages), gpu=False, quantize=quantize, verbose=verbose)
+    # EasyOCR guarda el parámetro como tupla ("self.quantize=quantize,"), que siempre es
+    # verdadera; se corrige para que un setDetector posterior respete la elección
+    reader.quantize = quantize
+    return reader
+
+def describe_reader(languages=OCR_LANGUAGES, quantize=OCR_QUANTIZE, torch_threads=OCR_TORCH_THREADS):
+    return f"{'/'.join(languages)}, {'int8' if quantize else 'fp32'}, hilos de torch: {torch_threads or 'auto'}"
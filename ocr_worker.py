@@ -0,0 +1,101 @@
+import threading
+from collections import deque
+
+# --- CONFIGURACIÓN ---
+OCR_MAX_PENDING = 1   # Trabajos en espera como máximo; los nuevos sustituyen a los antiguos
+
+class JobCancelled(Exception):
+    pass
+
+# -----------------------------------------------------------------------------
+# TRABAJO DE OCR
+# -----------------------------------------------------------------------------
+class OcrJob:
+    def __init__(self, worker, generation, fn, args, kind):
+        self.worker = worker; self.generation = generation
+        self.fn = fn; self.args = args; self.kind = kind
+
+    @property
+    def reader(self):
+        return self.worker.reader
+
+    def is_cancelled(self):
+        return self.generation < self.worker.cancel_before
+
+    def check(self):
+        # Punto de cancelación cooperativa entre etapas del pipeline
+        if self.is_cancelled(): raise JobCancelled()
+
+    def emit(self, signal, *args):
+        # Comprobación y emisión bajo el lock del worker: tras cancel_all() ningún
+        # trabajo reemplazado puede emitir resultados
+        with self.worker.condition:
+            if self.is_cancelled(): raise JobCancelled()
+            signal.emit(*args)
+
+# -----------------------------------------------------------------------------
+# WORKER ÚNICO QUE POSEE EL LECTOR DE EASYOCR
+# -----------------------------------------------------------------------------
+class OcrWorker(threading.Thread):
+    # reader_factory se ejecuta dentro del hilo: la carga del modelo no bloquea la interfaz
+    # y los trabajos enviados mientras tanto quedan en cola hasta que el lector está listo.
+    def __init__(self, reader_factory, max_pending=OCR_MAX_PENDING):
+        super().__init__(name="ocr-worker", daemon=True)
+        self.reader_factory = reader_factory; self.reader = None
+        self.ready = threading.Event()
+        self.pending = deque(maxlen=max_pending)
+        self.condition = threading.Condition()
+        self.generation = 0; self.cancel_before = 0
+        self.current_job = None; self.running = True
+        self.submitted = 0; self.superseded = 0; self.cancelled = 0; self.completed = 0; self.failed = 0
+
+    def submit(self, fn, *args, kind="ocr", supersede_running=True):
+        # Los trabajos pendientes siempre se descartan (gana el último). Con
+        # supersede_running=False el trabajo en curso termina (p. ej. refresco periódico).
+        with self.condition:
+            self.generation += 1
+            job = OcrJob(self, self.generation, fn, args, kind)
+            self.superseded += len(self.pending); self.pending.clear()
+            if supersede_running: self.cancel_before = job.generation
+            self.pending.append(job); self.submitted += 1
+            self.condition.notify()
+            return job
+
+    def cancel_all(self):
+        with self.condition:
+            self.superseded += len(self.pending); self.pending.clear()
+            self.cancel_before = self.generation + 1
+
+    def run(self):
+        try: self.reader = self.reader_factory()
+        except Exception as e:
+            print(f"Error cargando el modelo de OCR: {e}")
+            with self.condition: self.running = False; self.pending.clear()
+            return
+        self.ready.set()
+        while True:
+            with self.condition:
+                while self.running and not self.pending: self.condition.wait()
+                if not self.running: return
+                job = self.pending.popleft(); self.current_job = job
+            try:
+                job.check(); job.fn(job, *job.args)
+                with self.condition: self.completed += 1
+            except JobCancelled:
+                with self.condition: self.cancelled += 1
+            except Exception as e:
+                with self.condition: self.failed += 1
+                print(f"Error en trabajo de OCR ({job.kind}): {e}")
+            finally:
+                with self.condition: self.current_job = None
+
+    def stop(self):
+        with self.condition:
+            self.running = False; self.pending.clear()
+            self.cancel_before = self.generation + 1
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            return {'submitted': self.submitted, 'superseded': self.superseded, 'cancelled': self.cancelled,
+                    'completed': self.completed, 'failed': self.failed}
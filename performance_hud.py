@@ -0,0 +1,70 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QTimer, QRect
+from PyQt6.QtGui import QPainter, QColor, QFont, QFontMetrics, QGuiApplication
+
+from tracing import TRACE_BUCKETS_MS
+
+# --- CONFIGURACIÓN ---
+HUD_REFRESH_INTERVAL = 500     # ms entre repintados mientras el HUD está visible
+HUD_MARGIN = 12                # Distancia a la esquina superior derecha de la pantalla
+HUD_ROW_HEIGHT = 18
+HUD_BAR_WIDTH = 6              # Ancho de cada cubeta del histograma
+HUD_BACKGROUND = QColor(20, 20, 20, 200)
+HUD_TEXT_COLOR = QColor(230, 230, 230)
+HUD_BAR_COLOR = QColor(0x40, 0xA0, 0xFF)
+HUD_SLOW_COLOR = QColor(255, 120, 80)   # Cubetas por encima de HUD_SLOW_MS
+HUD_SLOW_MS = 200
+HUD_FONT_FAMILIES = ['Consolas', 'DejaVu Sans Mono', 'monospace']
+
+# -----------------------------------------------------------------------------
+# HUD DE RENDIMIENTO (PERCENTILES E HISTOGRAMAS POR MODO Y ETAPA)
+# -----------------------------------------------------------------------------
+class PerformanceHud(QWidget):
+    # Ventana flotante que no recibe el ratón; lee del Tracer solo cuando está visible
+    def __init__(self, tracer):
+        super().__init__()
+        self.tracer = tracer
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground); self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.font = QFont(); self.font.setFamilies(HUD_FONT_FAMILIES); self.font.setPixelSize(12)
+        self.metrics = QFontMetrics(self.font)
+        self.rows = []
+        self.refresh_timer = QTimer(self); self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh(); self.refresh_timer.start(HUD_REFRESH_INTERVAL)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        summary = self.tracer.summary(by_mode=True); histograms = self.tracer.histograms()
+        self.rows = [(label, summary[label], histograms[key]) for key in sorted(histograms, key=str)
+                     for label in ["/".join(str(k) for k in key)] if label in summary]
+        text_width = self.metrics.horizontalAdvance(self.row_text("x" * 24, {'count': 0, 'p50_ms': 0, 'p90_ms': 0, 'max_ms': 0}))
+        width = text_width + (len(TRACE_BUCKETS_MS) + 1) * HUD_BAR_WIDTH + 30
+        height = (max(1, len(self.rows)) + 1) * HUD_ROW_HEIGHT + 10
+        screen = QGuiApplication.primaryScreen().availableGeometry()
+        self.setGeometry(screen.right() - width - HUD_MARGIN, screen.top() + HUD_MARGIN, width, height)
+        self.update()
+
+    def row_text(self, label, stats):
+        return f"{label:<24} {stats['count']:>5} {stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+
+    def paintEvent(self, event):
+        painter = QPainter(self); painter.setFont(self.font)
+        painter.fillRect(self.rect(), HUD_BACKGROUND); painter.setPen(HUD_TEXT_COLOR)
+        header = f"{'modo/etapa':<24} {'n':>5} {'p50 ms':>8} {'p90 ms':>8} {'max ms':>8}"
+        painter.drawText(10, 5 + self.metrics.ascent(), header if self.rows else "Sin datos de trazas todavía")
+        bars_x = 20 + self.metrics.horizontalAdvance(header)
+        for i, (label, stats, counts) in enumerate(self.rows):
+            y = 5 + (i + 1) * HUD_ROW_HEIGHT
+            painter.setPen(HUD_TEXT_COLOR); painter.drawText(10, y + self.metrics.ascent(), self.row_text(label[:24], stats))
+            # Histograma normalizado por su cubeta más poblada
+            peak = max(1, int(counts.max()))
+            for b, count in enumerate(counts):
+                if not count: continue
+                bar_height = max(1, int((HUD_ROW_HEIGHT - 4) * count / peak))
+                slow = b >= len(TRACE_BUCKETS_MS) or TRACE_BUCKETS_MS[b] > HUD_SLOW_MS
+                painter.fillRect(QRect(bars_x + b * HUD_BAR_WIDTH, y + HUD_ROW_HEIGHT - 2 - bar_height, HUD_BAR_WIDTH - 1, bar_height),
+                                 HUD_SLOW_COLOR if slow else HUD_BAR_COLOR)
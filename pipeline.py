@@ -0,0 +1,236 @@
+import threading
+
+from frame_diff import FrameDiffGate, FrameChange
+from translation_cache import TranslationCache, CachedTranslator, normalize_text
+from batch_translator import BatchTranslator
+from tiled_ocr import TiledOcrEngine
+from incremental_ocr import IncrementalOcr
+from spatial_cache import SpatialResultCache
+from capture import CaptureService
+from layout_engine import group_paragraphs
+from language_id import LanguageIdentifier
+from ocr_reader import OCR_LANGUAGES
+from translation_backends import TRANSLATION_BACKEND, BACKENDS, create_backend
+from tracing import Tracer
+
+# --- CONFIGURACIÓN ---
+LABEL_KEY_GRID = 16      # Las etiquetas se identifican por texto + posición redondeada a esta rejilla (px físicos)
+TARGET_LANGUAGE = 'es'
+
+# -----------------------------------------------------------------------------
+# ETIQUETAS SIN INTERFAZ (BENCHMARKS Y REPRODUCCIÓN)
+# -----------------------------------------------------------------------------
+class CallbackSignal:
+    # Imita a un pyqtSignal conectado: emit() llama directamente a la función
+    def __init__(self, fn):
+        self.fn = fn
+
+    def emit(self, *args):
+        self.fn(*args)
+
+class HeadlessLabels:
+    # Mismo contrato que MainApp para el pipeline: tres señales y el diccionario de traducciones visibles
+    def __init__(self):
+        self.active_translations = {}
+        self.adds = 0; self.removes = 0; self.clears = 0
+        self.add_label_signal = CallbackSignal(self.add_label)
+        self.remove_label_signal = CallbackSignal(self.remove_label)
+        self.clear_all_labels_signal = CallbackSignal(self.clear_labels)
+
+    def add_label(self, key, data):
+        self.active_translations[key] = data; self.adds += 1
+
+    def remove_label(self, key):
+        self.active_translations.pop(key, None); self.removes += 1
+
+    def clear_labels(self):
+        self.active_translations.clear(); self.clears += 1
+
+# -----------------------------------------------------------------------------
+# PIPELINE CAPTURA -> OCR -> DISPOSICIÓN -> IDIOMA -> TRADUCCIÓN (SIN QT)
+# -----------------------------------------------------------------------------
+class TranslationPipeline:
+    # Los métodos run_* se ejecutan en el hilo de OCR con un trabajo (job) que aporta el
+    # lector (job.reader), la cancelación (job.check) y la emisión segura (job.emit).
+    # labels: objeto con add_label_signal, remove_label_signal, clear_all_labels_signal y
+    # active_translations (la ventana del overlay o HeadlessLabels).
+    # backend_factory sustituye a los backends con nombre (p. ej. un traductor simulado en los benchmarks).
+    def __init__(self, labels, backend_factory=None, backend_name=TRANSLATION_BACKEND, capture=None,
+                 translation_cache=None, language_id=None, tiled_engine=None, tracer=None, overlay_eraser=None):
+        self.labels = labels
+        # Captura persistente: un grabber por hilo y búferes de escala de grises reutilizados
+        self.capture = capture or CaptureService()
+        # Identificación de idioma (memoria + heurísticas + langdetect)
+        self.language_id = language_id or LanguageIdentifier(OCR_LANGUAGES)
+        # Caché de traducciones (LRU en memoria + SQLite persistente) delante del backend
+        self.translation_cache = translation_cache or TranslationCache()
+        # Backends de traducción con nombre, creados al primer uso en un hilo de traducción y
+        # compartidos entre hilos. La caché separa sus resultados por nombre de backend.
+        self.backend_name = backend_name; self.backends = {}; self.backends_lock = threading.Lock()
+        self.translator = CachedTranslator(None, self.translation_cache, backend=backend_name,
+                                           source=BACKENDS[backend_name].source, target=TARGET_LANGUAGE)
+        self.batch_translator = BatchTranslator(self.translator, backend_factory=backend_factory or self.current_backend)
+        # Compuerta de cambios para el refresco periódico del rectángulo
+        self.selection_gate = FrameDiffGate()
+        self.selection_results = {}
+        # OCR incremental: recuerda las cajas detectadas y solo reconoce los recortes que cambian
+        self.selection_ocr = IncrementalOcr(); self.pointer_ocr = IncrementalOcr()
+        # Caché espacial del modo puntero: resultados por coordenadas absolutas de pantalla
+        self.pointer_cache = SpatialResultCache()
+        # Pool de procesos para el OCR por teselas de pantalla completa (se arranca al primer uso)
+        self.tiled_engine = tiled_engine or TiledOcrEngine()
+        # Trazas por etapa, etiquetadas con el modo del trabajo (job.kind); desactivadas por defecto
+        self.tracer = tracer or Tracer()
+        # Borrado de las etiquetas propias en las capturas (solo si el overlay no se excluye de ellas)
+        self.overlay_eraser = overlay_eraser
+
+    def current_backend(self):
+        name = self.backend_name
+        with self.backends_lock:
+            if name not in self.backends: self.backends[name] = create_backend(name, target=TARGET_LANGUAGE)
+            return self.backends[name]
+
+    def set_backend(self, name):
+        # Las traducciones ya guardadas en la caché espacial y en el rectángulo son del backend anterior
+        # La clave de caché cambia antes que la generación de backends (BatchTranslator las lee al revés)
+        self.backend_name = name; self.translator.use_backend(name, BACKENDS[name].source)
+        self.batch_translator.reset_backends(); self.pointer_cache.clear(); self.reset_selection()
+
+    def grab_gray(self, region, reuse=True):
+        # Captura de la pantalla tal como se vería sin nuestras etiquetas
+        img_gray = self.capture.grab_gray(region, reuse=reuse)
+        if self.overlay_eraser is not None: self.overlay_eraser.erase((region['left'], region['top']), img_gray)
+        return img_gray
+
+    def reset_selection(self):
+        self.selection_gate.reset(); self.selection_ocr.reset(); self.selection_results = {}
+
+    # Pantalla completa: todos los monitores, divididos en teselas que se reconocen en paralelo
+    def run_fullscreen_ocr(self, job):
+        job.emit(self.labels.clear_all_labels_signal)
+        # Sin reutilizar búferes: las teselas se envían al pool de procesos de forma asíncrona
+        with self.tracer.span('capture', job.kind):
+            frames = [((monitor['left'], monitor['top']), self.grab_gray(monitor, reuse=False))
+                      for monitor in self.capture.monitors[1:]]
+        job.check()
+        results = self.tiled_engine.iter_results(frames, check=job.check)
+        while True:
+            # La etapa de OCR es la espera hasta que termina la siguiente tesela
+            with self.tracer.span('ocr', job.kind): origin, raw_results = next(results, (None, None))
+            if origin is None: break
+            with self.tracer.span('layout', job.kind): grouped_lines = group_paragraphs(raw_results)
+            self.stream_translations(job, self.lines_to_translate(job, grouped_lines), origin)
+
+    # --- CAMBIO CRÍTICO: Lógica de traducción paralela ---
+    # Refresco periódico del rectángulo seleccionado; job.check() corta el trabajo entre etapas si fue reemplazado
+    def run_ocr_and_update(self, job, bounding_box, selection_origin_physical):
+        try: self.run_ocr_pipeline(job, bounding_box, selection_origin_physical)
+        except BaseException:
+            # Un refresco interrumpido no debe dejar la firma como "ya procesada"
+            self.selection_gate.reset()
+            raise
+
+    def run_ocr_pipeline(self, job, bounding_box, selection_origin_physical):
+        new_results = {}
+        with self.tracer.span('capture', job.kind): img_gray = self.grab_gray(bounding_box)
+        job.check()
+        with self.tracer.span('diff', job.kind): change = self.selection_gate.check(img_gray)
+        # Sin cambios en la región: ni OCR ni traducción
+        if change.status == FrameChange.UNCHANGED: return
+        with self.tracer.span('ocr', job.kind): raw_results = self.selection_ocr.readtext(job.reader, img_gray, change)
+        job.check()
+        with self.tracer.span('layout', job.kind): grouped_lines = group_paragraphs(raw_results)
+        if change.status == FrameChange.PARTIAL:
+            # Solo se procesan las líneas de las franjas cambiadas; el resto se reutiliza
+            new_results = {k: v for k, v in self.selection_results.items() if not change.overlaps(v['bbox'])}
+            grouped_lines = [line for line in grouped_lines if change.overlaps(line['bbox'])]
+        job.check()
+
+        items_by_text = self.lines_to_translate(job, grouped_lines)
+
+        # Traducción por lotes: pocas peticiones al backend. Las etiquetas se actualizan al final para evitar parpadeo
+        with self.tracer.span('translate', job.kind): translations = self.batch_translator.translate_lines(list(items_by_text))
+        for text, translated_text in translations.items():
+            for key, data in self.make_translation_results(items_by_text.get(text, ()), text, translated_text, selection_origin_physical): new_results[key] = data
+        job.check()
+        self.selection_results = new_results
+        self.update_active_translations(new_results, job)
+        # Una línea sin traducción (error o plazo agotado del backend) no cuenta como procesada:
+        # la siguiente pasada vuelve a leer la región aunque sus píxeles no cambien
+        if any(text not in translations for text in items_by_text): self.selection_gate.reset()
+
+    def lines_to_translate(self, job, grouped_lines):
+        # Texto normalizado -> [líneas]: una frase repetida se traduce una vez pero cada línea tiene su etiqueta
+        with self.tracer.span('language_id', job.kind):
+            items_by_text = {}
+            for line in grouped_lines: items_by_text.setdefault(normalize_text(line['text']), []).append(line)
+            languages = self.language_id.detect_batch(list(items_by_text), check=job.check)
+        # Sin idioma detectable (sin letras) no se traduce; lo que ya está en el idioma destino tampoco
+        return {text: lines for text, lines in items_by_text.items() if languages.get(text) not in (None, TARGET_LANGUAGE)}
+
+    def make_translation_results(self, items, text, translated_text, selection_origin_physical):
+        # Una etiqueta (clave, datos) por cada línea con ese texto
+        if not translated_text or translated_text.lower() == text.lower(): return []
+        return [(self.label_key(text, item['bbox'], selection_origin_physical), {'translated': translated_text, 'bbox': item['bbox'], 'selection_origin': selection_origin_physical})
+                for item in items]
+
+    def label_key(self, text, bbox, selection_origin_physical):
+        # Texto + posición: la misma frase en dos sitios son dos etiquetas, y una línea que se mueve cambia de clave
+        x = int(selection_origin_physical[0] + bbox[0][0]) // LABEL_KEY_GRID; y = int(selection_origin_physical[1] + bbox[0][1]) // LABEL_KEY_GRID
+        return f"{text}@{x},{y}"
+
+    def stream_translations(self, job, items_by_text, selection_origin_physical):
+        def emit_result(text, translated_text):
+            for key, data in self.make_translation_results(items_by_text.get(text, ()), text, translated_text, selection_origin_physical):
+                job.emit(self.labels.add_label_signal, key, data)
+        with self.tracer.span('translate', job.kind): self.batch_translator.translate_lines(list(items_by_text), on_result=emit_result)
+
+    def update_active_translations(self, new_results, job):
+        active = self.labels.active_translations
+        old_keys = set(active.keys()); new_keys = set(new_results.keys())
+        for key in old_keys - new_keys: job.emit(self.labels.remove_label_signal, key)
+        for key in new_keys - old_keys: job.emit(self.labels.add_label_signal, key, new_results[key])
+        # Misma clave con datos distintos (nueva traducción o pequeño desplazamiento): se actualiza en sitio
+        for key in new_keys & old_keys:
+            if active.get(key) != new_results[key]: job.emit(self.labels.add_label_signal, key, new_results[key])
+
+    # Modo puntero: se sirven las líneas ya conocidas de la ventana y solo se lee lo nuevo o cambiado
+    def run_pointer_ocr(self, job, bounding_box, origin):
+        with self.tracer.span('capture', job.kind): img_gray = self.grab_gray(bounding_box)
+        job.check()
+        with self.tracer.span('spatial_cache', job.kind): plan = self.pointer_cache.lookup(origin, img_gray)
+        self.update_active_translations({e.key: e.data for e in plan.valid_entries}, job)
+        if not plan.regions: return
+
+        with self.tracer.span('ocr', job.kind): raw_results = self.pointer_ocr.read_regions(job.reader, img_gray, plan.regions)
+        job.check()
+        with self.tracer.span('layout', job.kind): grouped_lines = group_paragraphs(raw_results)
+        items_by_text = self.lines_to_translate(job, grouped_lines)
+        translated_lines = []
+        def on_result(text, translated_text):
+            for key, result in self.make_translation_results(items_by_text.get(text, ()), text, translated_text, origin):
+                # En la caché se guarda en coordenadas absolutas (origen 0,0)
+                bbox = [[p[0] + origin[0], p[1] + origin[1]] for p in result['bbox']]
+                data = {'translated': result['translated'], 'bbox': bbox, 'selection_origin': (0, 0)}
+                translated_lines.append((key, (bbox[0][0], bbox[0][1], bbox[2][0], bbox[2][1]), data))
+                job.emit(self.labels.add_label_signal, key, data)
+        with self.tracer.span('translate', job.kind): translations = self.batch_translator.translate_lines(list(items_by_text), on_result=on_result)
+        job.check()
+        # Las líneas que el backend no tradujo (error o plazo agotado) se vuelven a leer en la siguiente pasada
+        failed_rects = [(line['bbox'][0][0] + origin[0], line['bbox'][0][1] + origin[1], line['bbox'][2][0] + origin[0], line['bbox'][2][1] + origin[1])
+                        for text, lines in items_by_text.items() if text not in translations for line in lines]
+        self.pointer_cache.store(plan, translated_lines, failed_rects)
+        self.update_active_translations({e.key: e.data for e in self.pointer_cache.entries_in(origin, plan.size)}, job)
+
+    def stats(self):
+        return {'selection_frames': self.selection_gate.stats(), 'selection_ocr': self.selection_ocr.stats(),
+                'pointer_ocr': self.pointer_ocr.stats(), 'pointer_cache': self.pointer_cache.stats(),
+                'capture': self.capture.stats(), 'overlay_eraser': self.overlay_eraser.stats() if self.overlay_eraser else None,
+                'language_id': self.language_id.stats(),
+                'translation_cache': self.translator.stats(), 'batches': self.batch_translator.stats(),
+                'backends': {name: backend.stats() for name, backend in self.backends.items()},
+                'stages': self.tracer.summary()}
+
+    def close(self):
+        self.tiled_engine.shutdown(); self.batch_translator.shutdown(); self.translation_cache.close()
+        for backend in self.backends.values(): backend.close()
@@ -0,0 +1,180 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, defaultdict
+import numpy as np
+
+from frame_diff import grow_regions
+
+# --- CONFIGURACIÓN ---
+SPATIAL_CELL_SIZE = 64        # Celda de la rejilla (px físicos, coordenadas absolutas de pantalla)
+SPATIAL_BLOCK_SIZE = 8        # Cada celda se resume en bloques de 8x8 px promediados
+SPATIAL_BLOCK_THRESHOLD = 2.0 # Diferencia media (0-255) de un bloque para considerar la celda cambiada
+SPATIAL_MAX_ENTRIES = 2000    # Líneas traducidas recordadas
+SPATIAL_MAX_CELLS = 50000     # Celdas escaneadas recordadas
+SPATIAL_MAX_AGE = 300         # Segundos sin usarse antes de descartar una entrada
+SPATIAL_FULL_FRACTION = 0.7   # Si está sucia más de esta fracción de celdas se reprocesa la ventana entera
+SPATIAL_DUPLICATE_RATIO = 0.5 # Solape a partir del cual una línea nueva reemplaza a una guardada
+
+def rect_overlap_ratio(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0]); h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0: return 0.0
+    return (w * h) / max(1, min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1])))
+
+class SpatialEntry:
+    __slots__ = ('key', 'rect', 'data', 'cells', 'last_used')
+
+    def __init__(self, key, rect, data, cells):
+        self.key = key; self.rect = rect; self.data = data; self.cells = cells; self.last_used = time.monotonic()
+
+class SpatialPlan:
+    # Resultado de consultar la caché para una ventana: qué se puede servir y qué hay que leer
+    def __init__(self, origin, size, signatures, valid_entries, regions):
+        self.origin = origin; self.size = size; self.signatures = signatures
+        self.valid_entries = valid_entries
+        self.regions = regions  # franjas (x0, y0, x1, y1) en coordenadas de la ventana a pasar por OCR
+
+# -----------------------------------------------------------------------------
+# CACHÉ ESPACIAL DE RESULTADOS (REJILLA EN COORDENADAS DE PANTALLA)
+# -----------------------------------------------------------------------------
+class SpatialResultCache:
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE, max_entries=SPATIAL_MAX_ENTRIES,
+                 max_cells=SPATIAL_MAX_CELLS, max_age=SPATIAL_MAX_AGE):
+        self.cell_size = cell_size; self.max_entries = max_entries
+        self.max_cells = max_cells; self.max_age = max_age
+        self.lock = threading.Lock()
+        self.cells = OrderedDict()       # celda -> firma de sus bloques la última vez que se leyeron (NaN: nunca vistos)
+        self.grid = defaultdict(set)     # celda -> ids de las entradas que la tocan
+        self.entries = {}                # id -> SpatialEntry
+        self.ids = itertools.count()
+        self.lookups = 0; self.cells_clean = 0; self.cells_dirty = 0; self.entries_served = 0
+        self.invalidated = 0; self.evicted = 0
+
+    def cells_for_rect(self, rect):
+        cs = self.cell_size
+        return [(cx, cy) for cy in range(int(rect[1]) // cs, (int(rect[3]) - 1) // cs + 1)
+                for cx in range(int(rect[0]) // cs, (int(rect[2]) - 1) // cs + 1)]
+
+    def cell_signatures(self, origin, img_gray):
+        # Firma de cada celda que toca la ventana: la media de cada bloque de 8x8 px. Las celdas
+        # del borde se ven solo en parte; sus bloques fuera de la ventana (o cortados) quedan en NaN.
+        cs = self.cell_size; bs = SPATIAL_BLOCK_SIZE; ox, oy = origin; h, w = img_gray.shape[:2]
+        gx0, gy0 = ox // cs, oy // cs; cols, rows = -(-(ox + w) // cs) - gx0, -(-(oy + h) // cs) - gy0
+        canvas = np.full((rows * cs, cols * cs), np.nan, dtype=np.float32)
+        canvas[oy - gy0 * cs:oy - gy0 * cs + h, ox - gx0 * cs:ox - gx0 * cs + w] = img_gray
+        blocks = canvas.reshape(rows, cs // bs, bs, cols, cs // bs, bs).mean(axis=(2, 5))
+        signatures = {}
+        for r in range(rows):
+            for c in range(cols):
+                signature = blocks[r, :, c, :]
+                if not np.isnan(signature).all(): signatures[(gx0 + c, gy0 + r)] = signature
+        return signatures
+
+    @staticmethod
+    def same_cell(known, signature):
+        # Limpia si todos los bloques visibles ya se habían visto y no cambiaron
+        if known is None: return False
+        visible = ~np.isnan(signature)
+        if np.isnan(known[visible]).any(): return False
+        return not (np.abs(signature[visible] - known[visible]) > SPATIAL_BLOCK_THRESHOLD).any()
+
+    def remove_entry(self, entry_id):
+        entry = self.entries.pop(entry_id, None)
+        if entry is None: return
+        for cell in entry.cells:
+            ids = self.grid.get(cell)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids: del self.grid[cell]
+
+    def lookup(self, origin, img_gray):
+        h, w = img_gray.shape[:2]; ox, oy = origin; cs = self.cell_size
+        signatures = self.cell_signatures(origin, img_gray)
+        with self.lock:
+            self.lookups += 1
+            dirty = []; invalidated_rects = []
+            for cell, signature in signatures.items():
+                if self.same_cell(self.cells.get(cell), signature): self.cells.move_to_end(cell); continue
+                dirty.append(cell)
+                # Los píxeles cambiaron (o nunca se leyeron): se invalidan las líneas que tocan la celda
+                for entry_id in list(self.grid.get(cell, ())):
+                    invalidated_rects.append(self.entries[entry_id].rect)
+                    self.remove_entry(entry_id); self.invalidated += 1
+            self.cells_dirty += len(dirty); self.cells_clean += len(signatures) - len(dirty)
+            window = (ox, oy, ox + w, oy + h)
+            valid = [e for e in self.entries.values()
+                     if e.rect[0] >= window[0] and e.rect[1] >= window[1] and e.rect[2] <= window[2] and e.rect[3] <= window[3]]
+            now = time.monotonic()
+            for entry in valid: entry.last_used = now
+            known_rects = [e.rect for e in self.entries.values()] + invalidated_rects
+            self.entries_served += len(valid)
+        if not signatures or len(dirty) > SPATIAL_FULL_FRACTION * len(signatures): regions = [(0, 0, w, h)]
+        else:
+            # Franjas horizontales del ancho de la ventana alrededor de las filas sucias (+1 celda)
+            regions = []
+            for cy in sorted({cell[1] for cell in dirty}):
+                y0 = max(0, (cy - 1) * cs - oy); y1 = min(h, (cy + 2) * cs - oy)
+                if regions and y0 <= regions[-1][3]: regions[-1] = (0, regions[-1][1], w, y1)
+                else: regions.append((0, y0, w, y1))
+            # Las franjas cubren enteras las líneas (válidas o invalidadas) que cortan: leída a medias,
+            # una línea guardada se sustituiría por su versión recortada
+            rects = [(max(0, r[0] - ox), max(0, r[1] - oy), min(w, r[2] - ox), min(h, r[3] - oy))
+                     for r in known_rects]
+            regions = grow_regions(regions, [r for r in rects if r[2] > r[0] and r[3] > r[1]])
+        return SpatialPlan(origin, (w, h), signatures, valid, regions)
+
+    def store(self, plan, lines, failed_rects=()):
+        # lines: [(clave, rect_absoluto, datos)] de las líneas traducidas en las franjas leídas.
+        # failed_rects: rectángulos absolutos de las líneas que se quedaron sin traducción; sus
+        # celdas no se marcan como leídas para que la siguiente pasada las vuelva a procesar.
+        ox, oy = plan.origin; (w, h) = plan.size; cs = self.cell_size
+        unread = {cell for rect in failed_rects for cell in self.cells_for_rect(rect)}
+        with self.lock:
+            for cell, signature in plan.signatures.items():
+                if cell in unread: continue
+                # Parte de la celda que se ve en la ventana: tiene que estar entera en una franja leída
+                cx0 = max(0, cell[0] * cs - ox); cy0 = max(0, cell[1] * cs - oy)
+                cx1 = min(w, cell[0] * cs + cs - ox); cy1 = min(h, cell[1] * cs + cs - oy)
+                if any(x0 <= cx0 and cx1 <= x1 and y0 <= cy0 and cy1 <= y1 for x0, y0, x1, y1 in plan.regions):
+                    # Los bloques que esta ventana no ve conservan lo que se sabía de ellos
+                    known = self.cells.get(cell)
+                    self.cells[cell] = signature.copy() if known is None else np.where(np.isnan(signature), known, signature)
+                    self.cells.move_to_end(cell)
+            for key, rect, data in lines:
+                cells = self.cells_for_rect(rect)
+                # Una línea releída sustituye a la versión guardada que ocupa el mismo sitio
+                for entry_id in {i for cell in cells for i in self.grid.get(cell, ())}:
+                    if rect_overlap_ratio(self.entries[entry_id].rect, rect) > SPATIAL_DUPLICATE_RATIO: self.remove_entry(entry_id)
+                entry_id = next(self.ids)
+                self.entries[entry_id] = SpatialEntry(key, rect, data, cells)
+                for cell in cells: self.grid[cell].add(entry_id)
+            self.evict()
+
+    def entries_in(self, origin, size):
+        window = (origin[0], origin[1], origin[0] + size[0], origin[1] + size[1])
+        with self.lock:
+            return [e for e in self.entries.values()
+                    if e.rect[0] >= window[0] and e.rect[1] >= window[1] and e.rect[2] <= window[2] and e.rect[3] <= window[3]]
+
+    def evict(self):
+        # Se llama con el lock tomado: antigüedad máxima y después LRU por tamaño
+        now = time.monotonic()
+        expired = [i for i, e in self.entries.items() if now - e.last_used > self.max_age]
+        overflow = len(self.entries) - len(expired) - self.max_entries
+        if overflow > 0:
+            alive = sorted((e.last_used, i) for i, e in self.entries.items() if now - e.last_used <= self.max_age)
+            expired += [i for _, i in alive[:overflow]]
+        for entry_id in expired: self.remove_entry(entry_id)
+        self.evicted += len(expired)
+        while len(self.cells) > self.max_cells:
+            cell, _ = self.cells.popitem(last=False)
+            for entry_id in list(self.grid.get(cell, ())): self.remove_entry(entry_id); self.evicted += 1
+
+    def clear(self):
+        with self.lock: self.cells.clear(); self.grid.clear(); self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'cells': len(self.cells), 'lookups': self.lookups,
+                    'cells_clean': self.cells_clean, 'cells_dirty': self.cells_dirty, 'entries_served': self.entries_served,
+                    'invalidated': self.invalidated, 'evicted': self.evicted}
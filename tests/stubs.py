@@ -0,0 +1,79 @@
+import numpy as np
+
+class StubReader:
+    # Sustituto de easyocr.Reader: cada racha de filas con píxeles oscuros es una línea y el
+    # "texto" reconocido es el tamaño de la caja, así se ve si llegó recortada
+    def detect(self, img_gray, **params):
+        dark = img_gray < 128; rows = np.flatnonzero(dark.any(axis=1)); boxes = []
+        for run in np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1) if len(rows) else []:
+            cols = np.flatnonzero(dark[run[0]:run[-1] + 1].any(axis=0))
+            boxes.append([int(cols[0]), int(cols[-1]) + 1, int(run[0]), int(run[-1]) + 1])
+        return [boxes], [[]]
+
+    def recognize(self, img_gray, horizontal_list, free_list, reformat=False):
+        # Mismo formato que EasyOCR: la caja recortada a la imagen, el texto y la confianza
+        return [([[b[0], b[2]], [b[1], b[2]], [b[1], b[3]], [b[0], b[3]]], f"line {b[1] - b[0]}x{b[3] - b[2]}", 0.9)
+                for b in horizontal_list if self.recognizable(b)]
+
+    def recognizable(self, box):
+        return True
+
+def blank_frame(width=500, height=400):
+    return np.full((height, width), 255, dtype=np.uint8)
+
+class StubCapture:
+    # Misma interfaz que CaptureService; las capturas son recortes de una "pantalla" en memoria
+    def __init__(self, screen):
+        self.screen = screen
+
+    def grab_gray(self, region, reuse=True):
+        x0, y0 = region['left'], region['top']
+        return self.screen[y0:y0 + region['height'], x0:x0 + region['width']].copy()
+
+    def stats(self):
+        return {}
+
+class StubJob:
+    # Trabajo síncrono que nunca se cancela
+    kind = 'test'
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def check(self): pass
+
+    def emit(self, signal, *args):
+        signal.emit(*args)
+
+class StubLanguageId:
+    # Todo el texto reconocido por StubReader se trata como inglés
+    def detect_batch(self, texts, check=None):
+        return {text: 'en' for text in texts}
+
+    def stats(self):
+        return {}
+
+class StubBackend:
+    name = 'stub'; source = 'en'
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text, deadline=None):
+        self.calls += 1
+        return "\n".join(f"[es] {line}" for line in text.split("\n"))
+
+def make_pipeline(screen, **options):
+    # Pipeline sin pantalla, modelo ni red; devuelve también las etiquetas y el backend para inspeccionarlos
+    from pipeline import TranslationPipeline, HeadlessLabels
+    from translation_cache import TranslationCache
+    labels = HeadlessLabels(); backend = StubBackend()
+    pipeline = TranslationPipeline(labels, backend_factory=lambda: backend, capture=StubCapture(screen),
+                                   translation_cache=TranslationCache(disk_path=None), language_id=StubLanguageId(), **options)
+    pipeline.selection_ocr.prefilter = False; pipeline.pointer_ocr.prefilter = False
+    return pipeline, labels, backend
+
+def paint_label(screen, rect):
+    # Dibuja una etiqueta del overlay (fondo oscuro con "texto" claro) sobre la pantalla
+    x0, y0, x1, y1 = rect
+    screen[y0:y1, x0:x1] = 40; screen[y0 + 4:y1 - 4:3, x0 + 5:x1 - 5] = 240
@@ -0,0 +1,62 @@
+import threading
+
+from batch_translator import BatchTranslator
+from translation_cache import TranslationCache, CachedTranslator
+
+class BlockingBackend:
+    # Traduce con un prefijo propio y espera a que el test lo deje terminar
+    def __init__(self, prefix):
+        self.prefix = prefix; self.started = threading.Event(); self.release = threading.Event()
+
+    def translate(self, text):
+        self.started.set(); self.release.wait(5)
+        return "\n".join(f"{self.prefix} {line}" for line in text.split("\n"))
+
+def test_in_flight_batch_is_not_cached_under_the_new_backend():
+    google = BlockingBackend("[google]"); dictionary = BlockingBackend("[dict]"); dictionary.release.set()
+    backends = {'current': google}
+    cached = CachedTranslator(None, TranslationCache(disk_path=None), backend='google', source='auto', target='es')
+    batcher = BatchTranslator(cached, backend_factory=lambda: backends['current'])
+    worker = threading.Thread(target=batcher.translate_lines, args=(["Open file"],)); worker.start()
+    assert google.started.wait(5)
+    # Cambio de backend con el lote de Google todavía en vuelo
+    backends['current'] = dictionary; cached.use_backend('diccionario', 'en'); batcher.reset_backends()
+    google.release.set(); worker.join(5)
+    assert cached.lookup("Open file") is None
+    assert cached.lookup("Open file", ('google', 'auto', 'es')) is None
+    assert batcher.translate_lines(["Open file"]) == {"Open file": "[dict] Open file"}
+    assert cached.lookup("Open file") == "[dict] Open file"
+    batcher.shutdown()
+
+def test_backends_with_the_same_source_do_not_share_entries():
+    cache = TranslationCache(disk_path=None)
+    CachedTranslator(None, cache, backend='a', source='en', target='es').store("Open", "Abrir")
+    assert CachedTranslator(None, cache, backend='b', source='en', target='es').lookup("Open") is None
+
+class MergingBackend:
+    # Como Google con frases cortadas: une una línea que acaba en guion con la siguiente
+    def __init__(self):
+        self.requests = []
+
+    def translate(self, text):
+        self.requests.append(text)
+        return "\n".join(f"[es] {line}" for line in text.replace("-\n", "- ").split("\n"))
+
+def test_merged_lines_are_split_back_to_their_own_translations():
+    backend = MergingBackend()
+    cached = CachedTranslator(None, TranslationCache(disk_path=None), backend='stub', source='en', target='es')
+    batcher = BatchTranslator(cached, backend_factory=lambda: backend)
+    lines = ["Open file", "Save as-", "Close window", "Print", "Exit-", "Help"]
+    results = batcher.translate_lines(lines)
+    assert results == {line: f"[es] {line}" for line in lines}
+    assert batcher.stats()['split_fallbacks'] > 0
+    # Lo que se resolvió por partes también queda en la caché, línea a línea
+    assert all(cached.lookup(line) == f"[es] {line}" for line in lines)
+    batcher.shutdown()
+
+def test_dropped_lines_are_retranslated_one_by_one():
+    backend = MergingBackend(); backend.translate = lambda text: "[es] " + text.split("\n")[0]
+    cached = CachedTranslator(None, TranslationCache(disk_path=None), backend='stub', source='en', target='es')
+    batcher = BatchTranslator(cached, backend_factory=lambda: backend)
+    assert batcher.translate_lines(["One", "Two", "Three"]) == {"One": "[es] One", "Two": "[es] Two", "Three": "[es] Three"}
+    batcher.shutdown()
@@ -0,0 +1,52 @@
+import numpy as np
+
+from frame_diff import FrameChange
+from incremental_ocr import IncrementalOcr
+from tests.stubs import StubReader, blank_frame
+
+def partial_change(regions, changed_rows):
+    # Máscara de teselas de 64 px de una captura de 500x400 con las filas indicadas cambiadas
+    tiles = np.zeros((7, 8), dtype=bool); tiles[changed_rows, :] = True
+    return FrameChange(FrameChange.PARTIAL, tiles, regions)
+
+def test_line_straddling_a_changed_band_is_redetected_whole():
+    reader = StubReader(); ocr = IncrementalOcr(prefilter=False)
+    img = blank_frame(); img[310:330, 50:400] = 0
+    ocr.readtext(reader, img, FrameChange(FrameChange.FULL))
+    # Aparece texto nuevo encima; la franja cambiada termina a mitad de la línea existente
+    img[250:270, 50:300] = 0
+    change = partial_change([(0, 192, 500, 320)], [4])
+    texts = sorted(text for _, text, _ in ocr.readtext(reader, img, change))
+    assert texts == ["line 250x20", "line 350x20"]
+    assert change.regions == [(0, 192, 500, 330)]
+
+def test_unchanged_boxes_outside_the_band_are_kept():
+    reader = StubReader(); ocr = IncrementalOcr(prefilter=False)
+    img = blank_frame(); img[20:40, 50:400] = 0; img[310:330, 50:300] = 0
+    ocr.readtext(reader, img, FrameChange(FrameChange.FULL))
+    img[310:330, 50:300] = 255; img[312:328, 60:200] = 0
+    texts = sorted(text for _, text, _ in ocr.readtext(reader, img, partial_change([(0, 256, 500, 400)], [5])))
+    assert texts == ["line 140x16", "line 350x20"]
+    assert ocr.stats()['partial_detections'] == 1
+
+def test_large_change_triggers_full_redetection():
+    reader = StubReader(); ocr = IncrementalOcr(prefilter=False, redetect_fraction=0.3)
+    img = blank_frame(); img[20:40, 50:400] = 0
+    ocr.readtext(reader, img, FrameChange(FrameChange.FULL))
+    img[20:40, 50:400] = 255; img[100:120, 50:150] = 0
+    texts = [text for _, text, _ in ocr.readtext(reader, img, partial_change([(0, 0, 500, 192)], [0, 1, 2, 3]))]
+    assert texts == ["line 100x20"]
+    assert ocr.stats()['full_detections'] == 2 and ocr.stats()['partial_detections'] == 0
+
+class SkippingReader(StubReader):
+    # Como EasyOCR con una caja que no puede redimensionar: la omite sin avisar
+    def recognizable(self, box):
+        return box[1] - box[0] >= 10
+
+def test_skipped_box_does_not_shift_later_texts():
+    reader = SkippingReader(); ocr = IncrementalOcr(prefilter=False)
+    img = blank_frame(); img[20:40, 50:55] = 0; img[100:120, 50:300] = 0; img[200:220, 50:150] = 0
+    results = ocr.readtext(reader, img, FrameChange(FrameChange.FULL))
+    assert [(bbox[0][1], text) for bbox, text, _ in results] == [(100, "line 250x20"), (200, "line 100x20")]
+    # Tampoco se memoriza un texto con el recorte de otra caja
+    assert [text for _, text, _ in ocr.readtext(reader, img, FrameChange(FrameChange.FULL))] == ["line 250x20", "line 100x20"]
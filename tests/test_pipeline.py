@@ -0,0 +1,26 @@
+from capture import OverlayEraser
+from tests.stubs import StubJob, StubReader, blank_frame, make_pipeline, paint_label
+
+def test_static_selection_settles_when_only_overlay_labels_change():
+    screen = blank_frame(800, 600); screen[220:240, 150:500] = 0; clean = screen.copy()
+    label_rects = []
+    pipeline, labels, backend = make_pipeline(screen, overlay_eraser=OverlayEraser(lambda: label_rects))
+    region = {'left': 100, 'top': 100, 'width': 500, 'height': 300}; job = StubJob(StubReader())
+    pipeline.run_ocr_and_update(job, region, (100, 100))
+    assert len(labels.active_translations) == 1
+    # La etiqueta aparece y desaparece (repintados del overlay) sobre una página que no cambia
+    for k in range(4):
+        label_rects[:] = [(150, 218, 420, 244)] if k % 2 == 0 else []
+        screen[:] = clean
+        for rect in label_rects: paint_label(screen, rect)
+        pipeline.run_ocr_and_update(job, region, (100, 100))
+    assert pipeline.selection_gate.stats() == {'skipped': 4, 'partial': 0, 'processed': 1, 'total': 5}
+    assert backend.calls == 1 and labels.adds == 1 and labels.removes == 0
+
+def test_repeated_line_gets_one_label_per_position():
+    screen = blank_frame(800, 600); screen[150:170, 150:400] = 0; screen[330:350, 150:400] = 0
+    pipeline, labels, backend = make_pipeline(screen)
+    pipeline.run_ocr_and_update(StubJob(StubReader()), {'left': 100, 'top': 100, 'width': 500, 'height': 300}, (100, 100))
+    # La misma frase en dos sitios: una sola traducción, dos etiquetas
+    assert backend.calls == 1 and len(labels.active_translations) == 2
+    assert {data['bbox'][0][1] for data in labels.active_translations.values()} == {50, 230}
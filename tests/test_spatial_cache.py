@@ -0,0 +1,58 @@
+from incremental_ocr import IncrementalOcr
+from spatial_cache import SpatialResultCache
+from tests.stubs import StubReader, blank_frame
+
+def read_and_store(cache, ocr, origin, img):
+    # Lo mismo que hace el modo puntero, con la "traducción" igual al texto reconocido
+    plan = cache.lookup(origin, img); lines = []
+    for bbox, text, _ in ocr.read_regions(StubReader(), img, plan.regions):
+        rect = (bbox[0][0] + origin[0], bbox[0][1] + origin[1], bbox[2][0] + origin[0], bbox[2][1] + origin[1])
+        lines.append((f"{text}@{rect[0]},{rect[1]}", rect, text))
+    cache.store(plan, lines)
+    return plan
+
+def test_new_text_above_a_cached_line_does_not_clip_it():
+    cache = SpatialResultCache(); ocr = IncrementalOcr(prefilter=False)
+    img = blank_frame(500, 300); img[120:140, 50:400] = 0
+    read_and_store(cache, ocr, (0, 0), img)
+    # Solo cambian las celdas de la fila 0; la franja (filas 0-1) termina en y=128, a mitad de la línea
+    img[20:40, 50:300] = 0
+    plan = read_and_store(cache, ocr, (0, 0), img)
+    assert plan.regions == [(0, 0, 500, 140)]
+    assert sorted(e.data for e in cache.entries_in((0, 0), (500, 300))) == ["line 250x20", "line 350x20"]
+
+def test_label_painted_over_a_stored_line_is_still_served():
+    from capture import OverlayEraser
+    from tests.stubs import StubJob, make_pipeline, paint_label
+    screen = blank_frame(800, 600); screen[220:240, 150:500] = 0
+    label_rects = []
+    pipeline, labels, backend = make_pipeline(screen, overlay_eraser=OverlayEraser(lambda: label_rects))
+    region = {'left': 100, 'top': 100, 'width': 500, 'height': 300}; job = StubJob(StubReader())
+    pipeline.run_pointer_ocr(job, region, (100, 100))
+    assert list(labels.active_translations.values())[0]['translated'] == "[es] line 350x20"
+    first_pass_dirty = pipeline.pointer_cache.stats()['cells_dirty']
+    # El overlay pinta la etiqueta encima de la línea y la siguiente captura la incluye
+    label_rects.append((150, 218, 420, 244)); paint_label(screen, label_rects[0])
+    for _ in range(2): pipeline.run_pointer_ocr(job, region, (100, 100))
+    stats = pipeline.pointer_cache.stats()
+    assert stats['invalidated'] == 0 and stats['cells_dirty'] == first_pass_dirty and stats['entries_served'] == 2
+    assert backend.calls == 1 and len(labels.active_translations) == 1 and labels.removes == 0
+
+def test_change_in_a_partial_edge_cell_is_detected():
+    cache = SpatialResultCache(); ocr = IncrementalOcr(prefilter=False)
+    img = blank_frame(500, 300); img[100:120, 452:495] = 0
+    read_and_store(cache, ocr, (0, 0), img)
+    assert cache.lookup((0, 0), img).regions == []
+    # La columna de celdas 448-512 solo se ve hasta x=500
+    img[100:120, 452:495] = 255; img[100:120, 460:490] = 0
+    plan = cache.lookup((0, 0), img)
+    assert plan.regions == [(0, 0, 500, 192)] and plan.valid_entries == []
+    assert cache.stats()['invalidated'] == 1
+
+def test_window_moving_over_known_cells_keeps_them_clean():
+    cache = SpatialResultCache(); ocr = IncrementalOcr(prefilter=False)
+    screen = blank_frame(900, 600); screen[200:220, 150:400] = 0
+    read_and_store(cache, ocr, (0, 0), screen[0:400, 0:700])
+    # Una ventana más pequeña dentro de la ya leída: todo lo que ve ya se conoce
+    plan = cache.lookup((40, 30), screen[30:330, 40:540])
+    assert plan.regions == [] and [e.data for e in plan.valid_entries] == ["line 250x20"]
@@ -0,0 +1,54 @@
+import translation_cache
+from translation_cache import LRUCache, DiskCache, TranslationCache, CachedTranslator
+
+GOOGLE = ('google', 'auto', 'es')
+
+class StubTranslator:
+    name = 'stub'; source = 'en'; target = 'es'
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text):
+        self.calls += 1
+        return f"[es] {text}"
+
+def test_lru_evicts_least_recently_used_first():
+    lru = LRUCache(2)
+    lru.put('a', 1); lru.put('b', 2)
+    assert lru.get('a') == 1          # 'a' pasa a ser la más reciente
+    lru.put('c', 3)
+    assert lru.get('b') is None and lru.get('a') == 1 and lru.get('c') == 3
+    assert lru.stats() == {'entries': 2, 'hits': 3, 'misses': 1, 'evictions': 1}
+
+def test_disk_cache_survives_close_and_reopen(tmp_path):
+    path = str(tmp_path / "translations.sqlite3")
+    cache = TranslationCache(disk_path=path); cache.put("Open  file", GOOGLE, "Abrir archivo"); cache.close()
+    cache = TranslationCache(disk_path=path)
+    # Sin pasar por la LRU (recién creada): sale del disco y se promociona a memoria
+    assert cache.get("Open file", GOOGLE) == "Abrir archivo"
+    assert cache.get("Open file", GOOGLE) == "Abrir archivo"
+    stats = cache.stats()
+    assert stats['disk']['hits'] == 1 and stats['memory']['hits'] == 1 and stats['memory']['misses'] == 1
+    assert cache.get("Open file", ('diccionario', 'en', 'es')) is None
+    cache.close()
+
+def test_disk_cache_trims_least_recently_used_rows(tmp_path, monkeypatch):
+    # Reloj que siempre avanza: el orden de last_used no depende de la resolución de time.time()
+    clock = iter(range(1000)); monkeypatch.setattr(translation_cache.time, 'time', lambda: next(clock))
+    disk = DiskCache(str(tmp_path / "translations.sqlite3"), max_entries=2)
+    disk.put(("a", *GOOGLE), "A"); disk.put(("b", *GOOGLE), "B")
+    assert disk.get(("a", *GOOGLE)) == "A"
+    disk.put(("c", *GOOGLE), "C")
+    assert disk.get(("b", *GOOGLE)) is None and disk.get(("a", *GOOGLE)) == "A" and disk.get(("c", *GOOGLE)) == "C"
+    assert disk.stats() == {'entries': 2, 'hits': 3, 'misses': 1, 'evictions': 1}
+    disk.close()
+
+def test_cached_translator_calls_the_backend_once_per_text(tmp_path):
+    translator = StubTranslator()
+    cached = CachedTranslator(translator, TranslationCache(disk_path=str(tmp_path / "translations.sqlite3")))
+    assert cached.translate("Save") == "[es] Save"
+    assert cached.translate("Save ") == "[es] Save"
+    assert translator.calls == 1 and cached.stats()['backend_calls'] == 1
+    assert cached.namespace == ('stub', 'en', 'es')
+    cached.cache.close()
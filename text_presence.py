@@ -0,0 +1,57 @@
+import numpy as np
+
+# --- CONFIGURACIÓN ---
+PRESENCE_SCALE = 0.5             # El análisis se hace sobre la captura reducida
+PRESENCE_THRESHOLD = 0.15        # Densidad mínima de bordes de un componente para considerarlo texto
+PRESENCE_MIN_GRADIENT = 40       # Contraste mínimo (0-255) de un borde
+PRESENCE_MAX_LINE_HEIGHT = 60    # Alto máximo (px reducidos) de una línea de texto candidata
+PRESENCE_MARGIN = 8              # Margen (px físicos) alrededor de cada bloque candidato
+PRESENCE_FALLBACK_FRACTION = 0.6 # Si los bloques cubren más de esto, se usa la captura completa
+PRESENCE_MAX_REGIONS = 12        # Con más bloques que esto, una pasada completa sale más barata
+
+# -----------------------------------------------------------------------------
+# PRE-FILTRO DE PRESENCIA DE TEXTO
+# -----------------------------------------------------------------------------
+def find_text_regions(img_gray, threshold=PRESENCE_THRESHOLD, scale=PRESENCE_SCALE,
+                      fallback_fraction=PRESENCE_FALLBACK_FRACTION):
+    # Devuelve los bloques (x0, y0, x1, y1) con probable texto. Lista vacía: no hay texto.
+    # Si el filtro no puede descartar lo suficiente devuelve la captura completa.
+    import cv2
+    h, w = img_gray.shape[:2]
+    full_frame = [(0, 0, w, h)]
+    if h * scale < 8 or w * scale < 8: return full_frame
+    small = cv2.resize(img_gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    # Bordes: gradiente morfológico umbralizado (Otsu, con un contraste mínimo)
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    _, edges = cv2.threshold(gradient, max(otsu, PRESENCE_MIN_GRADIENT), 255, cv2.THRESH_BINARY)
+
+    # Las letras de una línea se unen con un cierre horizontal; cada componente es una línea candidata
+    connected = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(connected, connectivity=8)
+    lines_mask = np.zeros_like(edges)
+    for x, y, bw, bh, _ in stats[1:count]:
+        if bh < 4 or bh > PRESENCE_MAX_LINE_HEIGHT or bw < bh: continue
+        density = cv2.countNonZero(edges[y:y + bh, x:x + bw]) / float(bw * bh)
+        if threshold <= density <= 0.9: lines_mask[y:y + bh, x:x + bw] = 255
+
+    # Las líneas cercanas se agrupan en bloques para no llamar al OCR por cada una
+    blocks_mask = cv2.dilate(lines_mask, cv2.getStructuringElement(cv2.MORPH_RECT, (25, 9)))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(blocks_mask, connectivity=8)
+    if count <= 1: return []
+    if count - 1 > PRESENCE_MAX_REGIONS: return full_frame
+    regions = []; covered = 0
+    for x, y, bw, bh, _ in stats[1:count]:
+        x0 = max(0, int(x / scale) - PRESENCE_MARGIN); y0 = max(0, int(y / scale) - PRESENCE_MARGIN)
+        x1 = min(w, int((x + bw) / scale) + PRESENCE_MARGIN); y1 = min(h, int((y + bh) / scale) + PRESENCE_MARGIN)
+        regions.append((x0, y0, x1, y1)); covered += (x1 - x0) * (y1 - y0)
+    if covered > fallback_fraction * w * h: return full_frame
+    return regions
+
+def clip_to_regions(rect, regions):
+    # Rectángulo mínimo dentro de `rect` que contiene su intersección con los bloques; None si no toca ninguno
+    parts = [(max(rect[0], r[0]), max(rect[1], r[1]), min(rect[2], r[2]), min(rect[3], r[3])) for r in regions]
+    parts = [p for p in parts if p[2] > p[0] and p[3] > p[1]]
+    if not parts: return None
+    return (min(p[0] for p in parts), min(p[1] for p in parts), max(p[2] for p in parts), max(p[3] for p in parts))
@@ -0,0 +1,160 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from text_presence import find_text_regions, clip_to_regions
+from ocr_reader import OCR_LANGUAGES, OCR_QUANTIZE, OCR_TORCH_THREADS, create_reader
+
+# --- CONFIGURACIÓN ---
+TILE_MAX_WIDTH = 1920        # Ancho máximo de tesela (px físicos); las líneas rara vez se cortan
+TILE_HEIGHT = 360            # Alto de cada tesela
+TILE_OVERLAP_X = 256         # Solape horizontal entre teselas vecinas
+TILE_OVERLAP_Y = 64          # Solape vertical (mayor que la altura de una línea de texto)
+TILE_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+TILE_DUPLICATE_RATIO = 0.5   # Intersección / área menor a partir de la cual dos cajas son la misma
+TILE_SEAM_MARGIN = 8         # Margen alrededor de una línea cortada por una costura al volver a leerla
+OCR_PARAMS = {'width_ths': 0.6, 'text_threshold': 0.6, 'low_text': 0.4}
+
+# -----------------------------------------------------------------------------
+# PROCESOS DEL POOL: CADA UNO CON SU PROPIO LECTOR
+# -----------------------------------------------------------------------------
+worker_reader = None
+
+def init_tile_worker(languages, quantize, torch_threads):
+    global worker_reader
+    worker_reader = create_reader(languages, quantize=quantize, torch_threads=torch_threads)
+
+def ocr_tile(tile_img, x0, y0):
+    # Devuelve los resultados en coordenadas del monitor (no de la tesela)
+    results = worker_reader.readtext(tile_img, **OCR_PARAMS)
+    return [([[float(p[0]) + x0, float(p[1]) + y0] for p in bbox], text, float(conf)) for bbox, text, conf in results]
+
+# -----------------------------------------------------------------------------
+# GEOMETRÍA DE TESELAS Y DEDUPLICACIÓN
+# -----------------------------------------------------------------------------
+def axis_spans(length, max_size, overlap):
+    # Menor número de teselas de tamaño <= max_size, del mismo tamaño y con `overlap` px de solape
+    if length <= max_size: return [(0, length)]
+    count = -(-(length - overlap) // (max_size - overlap))
+    size = -(-(length + (count - 1) * overlap) // count)
+    return [(min(i * (size - overlap), length - size), min(i * (size - overlap), length - size) + size) for i in range(count)]
+
+def split_into_tiles(width, height, max_width=TILE_MAX_WIDTH, tile_height=TILE_HEIGHT,
+                     overlap_x=TILE_OVERLAP_X, overlap_y=TILE_OVERLAP_Y):
+    return [(x0, y0, x1, y1)
+            for y0, y1 in axis_spans(height, tile_height, overlap_y) for x0, x1 in axis_spans(width, max_width, overlap_x)]
+
+def box_rect(bbox):
+    xs = [p[0] for p in bbox]; ys = [p[1] for p in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def intersection_area(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0]); h = min(a[3], b[3]) - max(a[1], b[1])
+    return w * h if w > 0 and h > 0 else 0
+
+def touches_inner_edge(rect, tile, width, height, margin=2):
+    # Una caja pegada a un borde interior de la tesela probablemente está cortada
+    x0, y0, x1, y1 = tile
+    return ((x0 > 0 and rect[0] <= x0 + margin) or (y0 > 0 and rect[1] <= y0 + margin) or
+            (x1 < width and rect[2] >= x1 - margin) or (y1 < height and rect[3] >= y1 - margin))
+
+def deduplicate(candidates):
+    # candidates: [(resultado, rect, cortada, tesela)]. Primero las cajas completas y más grandes.
+    kept = []
+    for result, rect, is_cut, _ in sorted(candidates, key=lambda c: (c[2], -(c[1][2] - c[1][0]) * (c[1][3] - c[1][1]))):
+        area = max(1, (rect[2] - rect[0]) * (rect[3] - rect[1]))
+        if all(intersection_area(rect, k[1]) / max(1, min(area, (k[1][2] - k[1][0]) * (k[1][3] - k[1][1]))) < TILE_DUPLICATE_RATIO for k in kept):
+            kept.append((result, rect, is_cut))
+    return [k[0] for k in kept]
+
+def same_line(a, b, margin=TILE_SEAM_MARGIN):
+    # Misma línea: solapan en vertical al menos la mitad de la menor y se tocan en horizontal
+    overlap = min(a[3], b[3]) - max(a[1], b[1])
+    return overlap >= 0.5 * min(a[3] - a[1], b[3] - b[1]) and a[0] <= b[2] + margin and b[0] <= a[2] + margin
+
+def seam_lines(candidates):
+    # candidates: [(resultado, rect, cortada, tesela)]. Une los fragmentos cortados de teselas
+    # distintas que están en la misma línea; devuelve el rectángulo de cada línea partida.
+    groups = [(c[1], {c[3]}) for c in candidates if c[2]]
+    merged = True
+    while merged:
+        merged = False
+        for i, j in itertools.combinations(range(len(groups)), 2):
+            if same_line(groups[i][0], groups[j][0]):
+                a, b = groups[i][0], groups[j][0]
+                groups[i] = ((min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])), groups[i][1] | groups[j][1])
+                del groups[j]; merged = True; break
+    return [rect for rect, tiles in groups if len(tiles) > 1]
+
+# -----------------------------------------------------------------------------
+# MOTOR DE OCR POR TESELAS
+# -----------------------------------------------------------------------------
+class TiledOcrEngine:
+    def __init__(self, languages=OCR_LANGUAGES, workers=TILE_WORKERS, quantize=OCR_QUANTIZE):
+        self.languages = tuple(languages); self.workers = workers; self.quantize = quantize
+        self.executor = None
+
+    def start(self):
+        # El pool se crea una vez y se reutiliza: cargar un lector por proceso es caro
+        if self.executor is None:
+            torch_threads = max(1, (OCR_TORCH_THREADS or os.cpu_count() or 1) // self.workers)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_tile_worker,
+                                                initargs=(self.languages, self.quantize, torch_threads))
+        return self.executor
+
+    def iter_results(self, frames, check=None, prefilter=True):
+        # frames: [(origen_físico, img_gray)] uno por monitor. Produce (origen, resultados) a medida
+        # que terminan las teselas: primero las cajas del núcleo de cada tesela (definitivas) y,
+        # cuando un monitor termina, las de las zonas de solape ya deduplicadas. Las líneas partidas
+        # por una costura se vuelven a leer enteras antes de deduplicar.
+        executor = self.start()
+        futures = {}; monitors = []
+        for origin, img_gray in frames:
+            height, width = img_gray.shape[:2]
+            tiles = split_into_tiles(width, height)
+            if prefilter:
+                # Solo se envían las teselas con texto probable, recortadas a sus bloques candidatos
+                regions = find_text_regions(img_gray)
+                tiles = list(dict.fromkeys(t for t in (clip_to_regions(tile, regions) for tile in tiles) if t is not None))
+            monitors.append({'origin': origin, 'size': (width, height), 'image': img_gray, 'tiles': tiles,
+                             'pending': len(tiles), 'deferred': [], 'seams_read': False})
+            for tile in tiles:
+                x0, y0, x1, y1 = tile
+                future = executor.submit(ocr_tile, img_gray[y0:y1, x0:x1], x0, y0)
+                futures[future] = (len(monitors) - 1, tile, None)
+        not_done = set(futures)
+        try:
+            while not_done:
+                done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, tile, seam = futures[future]; monitor = monitors[index]
+                    monitor['pending'] -= 1
+                    try: results = future.result()
+                    except Exception as e: print(f"Error en tesela {tile or seam}: {e}"); results = []
+                    core = []
+                    for result in results:
+                        rect = box_rect(result[0])
+                        if tile is None:
+                            # Relectura de una costura: solo cuentan las cajas de la línea partida (seam),
+                            # no los trozos de las vecinas que entran por el margen
+                            if seam[1] <= (rect[1] + rect[3]) / 2 <= seam[3]: monitor['deferred'].append((result, rect, False, None))
+                        elif any(intersection_area(rect, other) for other in monitor['tiles'] if other != tile):
+                            monitor['deferred'].append((result, rect, touches_inner_edge(rect, tile, *monitor['size']), tile))
+                        else: core.append(result)
+                    if check: check()
+                    if core: yield monitor['origin'], core
+                    if monitor['pending'] == 0 and monitor['deferred']:
+                        seams = [] if monitor['seams_read'] else seam_lines(monitor['deferred'])
+                        monitor['seams_read'] = True
+                        if not seams: yield monitor['origin'], deduplicate(monitor['deferred']); continue
+                        width, height = monitor['size']; m = TILE_SEAM_MARGIN
+                        for line in seams:
+                            x0 = max(0, int(line[0]) - m); y0 = max(0, int(line[1]) - m)
+                            x1 = min(width, int(line[2]) + m); y1 = min(height, int(line[3]) + m)
+                            future = executor.submit(ocr_tile, monitor['image'][y0:y1, x0:x1], x0, y0)
+                            futures[future] = (index, None, line); not_done.add(future); monitor['pending'] += 1
+        finally:
+            for future in not_done: future.cancel()
+
+    def shutdown(self):
+        if self.executor is not None: self.executor.shutdown(wait=False, cancel_futures=True); self.executor = None
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+
+import numpy as np
+
+# --- CONFIGURACIÓN ---
+TRACE_HISTORY = 512            # Duraciones recordadas por (modo, etapa) para los histogramas
+TRACE_MAX_EVENTS = 200000      # Eventos guardados para exportar (los más antiguos se descartan)
+TRACE_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000]  # Límites superiores del histograma
+TRACE_EXPORT_DIR = os.path.join(os.path.expanduser("~"), ".traductor_overlay", "trazas")
+
+NULL_SPAN = nullcontext()  # Desactivado, span() devuelve siempre este objeto: sin reloj ni locks
+
+class Span:
+    __slots__ = ('tracer', 'name', 'mode', 'args', 'start')
+
+    def __init__(self, tracer, name, mode, args):
+        self.tracer = tracer; self.name = name; self.mode = mode; self.args = args; self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns(); return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, self.mode, self.start, time.perf_counter_ns(), self.args, exc_type)
+        return False
+
+# -----------------------------------------------------------------------------
+# TRAZAS POR ETAPA (EXPORTABLES A CHROME TRACE-EVENT)
+# -----------------------------------------------------------------------------
+class Tracer:
+    # Uso: with tracer.span('ocr', job.kind): ...
+    # Cada span guarda un evento (para chrome://tracing o Perfetto) y su duración en una
+    # ventana deslizante por (modo, etapa), de la que salen percentiles e histogramas.
+    def __init__(self, enabled=False, history=TRACE_HISTORY, max_events=TRACE_MAX_EVENTS):
+        self.enabled = enabled; self.history = history
+        self.lock = threading.Lock()
+        self.events = deque(maxlen=max_events)
+        self.samples = defaultdict(lambda: deque(maxlen=self.history))
+        self.thread_names = {}
+        self.origin_ns = time.perf_counter_ns()
+
+    def span(self, name, mode=None, **args):
+        if not self.enabled: return NULL_SPAN
+        return Span(self, name, mode, args)
+
+    def record(self, name, mode, start_ns, end_ns, args, exc_type=None):
+        thread = threading.current_thread()
+        if exc_type is not None: args = dict(args, error=exc_type.__name__)
+        with self.lock:
+            self.events.append((name, mode, start_ns, end_ns, thread.ident, args))
+            self.samples[(mode, name)].append((end_ns - start_ns) / 1e6)
+            self.thread_names.setdefault(thread.ident, thread.name)
+
+    def clear(self):
+        with self.lock: self.events.clear(); self.samples.clear()
+
+    def durations(self, by_mode=True):
+        # {(modo, etapa) o etapa: array de milisegundos}
+        with self.lock: items = [(key, list(values)) for key, values in self.samples.items() if values]
+        if by_mode: return {key: np.array(values) for key, values in items}
+        merged = defaultdict(list)
+        for (_, name), values in items: merged[name] += values
+        return {name: np.array(values) for name, values in merged.items()}
+
+    def summary(self, by_mode=False):
+        result = {}
+        for key, ms in sorted(self.durations(by_mode).items(), key=lambda kv: str(kv[0])):
+            label = "/".join(str(k) for k in key) if by_mode else key
+            result[label] = {'count': len(ms), 'p50_ms': round(float(np.percentile(ms, 50)), 3),
+                             'p90_ms': round(float(np.percentile(ms, 90)), 3), 'p99_ms': round(float(np.percentile(ms, 99)), 3),
+                             'max_ms': round(float(ms.max()), 3), 'total_ms': round(float(ms.sum()), 3)}
+        return result
+
+    def histograms(self):
+        # {(modo, etapa): recuentos por cubeta de TRACE_BUCKETS_MS (+ una final para lo que excede)}
+        return {key: np.bincount(np.searchsorted(TRACE_BUCKETS_MS, ms), minlength=len(TRACE_BUCKETS_MS) + 1)
+                for key, ms in self.durations().items()}
+
+    def chrome_trace(self):
+        # Formato "Trace Event" (eventos completos "X", tiempos en microsegundos)
+        with self.lock: events = list(self.events); thread_names = dict(self.thread_names)
+        pid = os.getpid()
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in thread_names.items()]
+        for name, mode, start_ns, end_ns, tid, args in events:
+            trace.append({'name': name, 'cat': mode or 'general', 'ph': 'X', 'pid': pid, 'tid': tid,
+                          'ts': (start_ns - self.origin_ns) / 1000, 'dur': (end_ns - start_ns) / 1000,
+                          'args': dict(args, mode=mode) if mode else args})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path=None):
+        if path is None:
+            os.makedirs(TRACE_EXPORT_DIR, exist_ok=True)
+            path = os.path.join(TRACE_EXPORT_DIR, time.strftime("traza-%Y%m%d-%H%M%S.json"))
+        with open(path, 'w', encoding='utf-8') as f: json.dump(self.chrome_trace(), f, default=str)
+        return path
@@ -0,0 +1,271 @@
+import html
+import os
+import random
+import re
+import threading
+import time
+
+# --- CONFIGURACIÓN ---
+TRANSLATION_BACKEND = 'google'     # Backend por defecto: 'google' (en línea) o 'diccionario' (sin conexión)
+GOOGLE_URL = "https://translate.google.com/m"
+BACKEND_MAX_CONCURRENCY = 4        # Peticiones HTTP simultáneas como máximo (también el tamaño del pool de conexiones)
+BACKEND_RATE = 5.0                 # Peticiones por segundo sostenidas (token bucket)
+BACKEND_BURST = 8                  # Peticiones que se pueden hacer seguidas antes de esperar al ritmo sostenido
+BACKEND_DEADLINE = 8.0             # Segundos máximos por translate(), incluidas esperas y reintentos
+BACKEND_CONNECT_TIMEOUT = 3.0      # Segundos para abrir la conexión (dentro del plazo anterior)
+BACKEND_RETRIES = 3                # Reintentos tras 429/5xx/errores de red
+BACKEND_BACKOFF = 0.25             # Espera base del backoff exponencial (con jitter completo)
+BACKEND_MIN_RATE = 0.5             # Ritmo mínimo al que se baja tras respuestas 429/503
+BACKEND_RECOVERY = 0.02            # Fracción del ritmo configurado que se recupera por cada respuesta correcta
+DICTIONARY_PATH = os.path.join(os.path.expanduser("~"), ".traductor_overlay", "diccionario.tsv")
+DICTIONARY_MAX_PHRASE_WORDS = 4    # Expresiones de hasta N palabras se buscan antes que las palabras sueltas
+
+class DeadlineExceeded(Exception):
+    pass
+
+class BackendError(Exception):
+    pass
+
+# -----------------------------------------------------------------------------
+# LIMITADOR DE RITMO (TOKEN BUCKET)
+# -----------------------------------------------------------------------------
+class TokenBucket:
+    # rate fichas por segundo hasta un máximo de burst. throttle() aplica la contrapresión del
+    # servidor: vacía el cubo durante el Retry-After (todos los hilos frenan a la vez) y reduce
+    # el ritmo a la mitad; recover() lo devuelve poco a poco al configurado (AIMD).
+    def __init__(self, rate=BACKEND_RATE, burst=BACKEND_BURST, min_rate=BACKEND_MIN_RATE, recovery=BACKEND_RECOVERY):
+        self.rate = rate; self.max_rate = rate; self.min_rate = min(min_rate, rate); self.recovery = recovery; self.burst = burst
+        self.tokens = float(burst); self.updated = time.monotonic(); self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.waits = 0; self.wait_time = 0.0
+
+    def reserve(self, now):
+        # Toma una ficha (puede quedar en negativo) y devuelve cuánto hay que esperar para usarla
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate); self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate, self.paused_until - now)
+
+    def try_acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.reserve(now) > 0: self.tokens += 1; return False
+            return True
+
+    def acquire(self, deadline=None):
+        with self.lock:
+            now = time.monotonic(); wait = self.reserve(now)
+            if deadline is not None and now + wait > deadline:
+                self.tokens += 1; raise DeadlineExceeded(f"el limitador de ritmo pide esperar {wait:.2f} s")
+            if wait: self.waits += 1; self.wait_time += wait
+        if wait: time.sleep(wait)
+
+    def throttle(self, seconds=0.0):
+        with self.lock:
+            now = time.monotonic()
+            # Los 429 de las peticiones que ya estaban en vuelo durante la pausa cuentan como un solo aviso
+            if now >= self.paused_until: self.rate = max(self.min_rate, self.rate / 2)
+            self.paused_until = max(self.paused_until, now + seconds); self.tokens = min(self.tokens, 0.0)
+
+    def recover(self):
+        with self.lock: self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+    def stats(self):
+        with self.lock: return {'waits': self.waits, 'wait_s': round(self.wait_time, 3), 'rate': round(self.rate, 2)}
+
+# -----------------------------------------------------------------------------
+# BACKEND EN LÍNEA: GOOGLE TRANSLATE (VERSIÓN MÓVIL, MISMA PETICIÓN QUE deep_translator)
+# -----------------------------------------------------------------------------
+class GoogleWebBackend:
+    # Seguro entre hilos: una sola instancia con una sesión HTTP persistente (keep-alive)
+    # compartida por los hilos de traducción. Interfaz común de los backends:
+    # translate(texto, deadline=None) -> texto traducido, stats(), close() y el atributo source.
+    name = 'google'
+    source = 'auto'
+    RESULT_PATTERN = re.compile(r'<div[^>]*class="result-container"[^>]*>(.*?)</div>', re.S)
+
+    def __init__(self, target='es', url=GOOGLE_URL, max_concurrency=BACKEND_MAX_CONCURRENCY, rate=BACKEND_RATE,
+                 burst=BACKEND_BURST, deadline=BACKEND_DEADLINE, retries=BACKEND_RETRIES, backoff=BACKEND_BACKOFF):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.requests = requests
+        self.target = target; self.url = url; self.deadline = deadline; self.retries = retries; self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter); self.session.mount("https://", adapter)
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self.lock = threading.Lock()
+        self.calls = 0; self.http_requests = 0; self.retried = 0; self.throttled = 0; self.deadline_misses = 0; self.failures = 0
+
+    def translate(self, text, deadline=None):
+        deadline = deadline if deadline is not None else time.monotonic() + self.deadline
+        with self.lock: self.calls += 1
+        try: return self.request_with_retries(text, deadline)
+        except DeadlineExceeded:
+            with self.lock: self.deadline_misses += 1
+            raise
+        except Exception:
+            with self.lock: self.failures += 1
+            raise
+
+    def request_with_retries(self, text, deadline):
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                response = self.request(text, deadline)
+                if response.status_code == 200: self.bucket.recover(); return self.parse(response.text)
+                if response.status_code not in (429, 500, 502, 503, 504):
+                    raise BackendError(f"respuesta HTTP {response.status_code}")
+                if response.status_code in (429, 503):
+                    # Contrapresión del servidor: se frena el cubo para todos los hilos
+                    with self.lock: self.throttled += 1
+                    retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+                    self.bucket.throttle(retry_after or 0.0)
+                error = BackendError(f"respuesta HTTP {response.status_code}")
+            except (self.requests.ConnectionError, self.requests.Timeout) as e:
+                if time.monotonic() >= deadline: raise DeadlineExceeded(f"plazo agotado esperando la respuesta ({type(e).__name__})") from e
+                error = e
+            if attempt == self.retries: raise error
+            wait = retry_after if retry_after is not None else random.uniform(0, self.backoff * 2 ** attempt)
+            if time.monotonic() + wait > deadline: raise DeadlineExceeded(f"sin tiempo para reintentar ({error})")
+            with self.lock: self.retried += 1
+            time.sleep(wait)
+
+    def request(self, text, deadline):
+        self.bucket.acquire(deadline)
+        if not self.slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise DeadlineExceeded("sin hueco en el límite de concurrencia")
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: raise DeadlineExceeded("plazo agotado antes de enviar la petición")
+            with self.lock: self.http_requests += 1
+            return self.session.get(self.url, params={'tl': self.target, 'sl': self.source, 'q': text},
+                                    timeout=(min(BACKEND_CONNECT_TIMEOUT, remaining), remaining))
+        finally: self.slots.release()
+
+    def parse(self, body):
+        match = self.RESULT_PATTERN.search(body)
+        if not match: raise BackendError("respuesta sin traducción")
+        return html.unescape(match.group(1))
+
+    @staticmethod
+    def parse_retry_after(value):
+        try: return max(0.0, float(value))
+        except (TypeError, ValueError): return None
+
+    def close(self):
+        self.session.close()
+
+    def stats(self):
+        with self.lock:
+            stats = {'calls': self.calls, 'http_requests': self.http_requests, 'retries': self.retried, 'throttled': self.throttled,
+                     'deadline_misses': self.deadline_misses, 'failures': self.failures}
+        stats['rate_limiter'] = self.bucket.stats()
+        return stats
+
+# -----------------------------------------------------------------------------
+# BACKEND SIN CONEXIÓN: DICCIONARIO INGLÉS -> ESPAÑOL
+# -----------------------------------------------------------------------------
+BUILTIN_DICTIONARY = {
+    # Interfaz
+    "file": "archivo", "edit": "editar", "view": "ver", "help": "ayuda", "settings": "configuración", "options": "opciones",
+    "tools": "herramientas", "window": "ventana", "open": "abrir", "close": "cerrar", "save": "guardar", "save as": "guardar como",
+    "save all": "guardar todo", "new": "nuevo", "delete": "eliminar", "remove": "quitar", "cancel": "cancelar", "ok": "aceptar",
+    "apply": "aplicar", "yes": "sí", "no": "no", "search": "buscar", "find": "buscar", "replace": "reemplazar", "copy": "copiar",
+    "paste": "pegar", "cut": "cortar", "undo": "deshacer", "redo": "rehacer", "print": "imprimir", "exit": "salir", "quit": "salir",
+    "back": "atrás", "next": "siguiente", "previous": "anterior", "finish": "finalizar", "continue": "continuar", "start": "iniciar",
+    "stop": "detener", "pause": "pausar", "play": "reproducir", "download": "descargar", "upload": "subir", "install": "instalar",
+    "update": "actualizar", "updates": "actualizaciones", "refresh": "actualizar", "restart": "reiniciar", "share": "compartir",
+    "sign in": "iniciar sesión", "sign out": "cerrar sesión", "log in": "iniciar sesión", "log out": "cerrar sesión",
+    "sign up": "registrarse", "account": "cuenta", "password": "contraseña", "username": "nombre de usuario", "profile": "perfil",
+    "home": "inicio", "menu": "menú", "more": "más", "less": "menos", "show": "mostrar", "hide": "ocultar", "enable": "activar",
+    "disable": "desactivar", "recent": "reciente", "recent documents": "documentos recientes", "documents": "documentos",
+    "document": "documento", "folder": "carpeta", "folders": "carpetas", "files": "archivos", "project": "proyecto",
+    "projects": "proyectos", "changes": "cambios", "change": "cambio", "error": "error", "warning": "advertencia",
+    "loading": "cargando", "please wait": "espere, por favor", "feedback": "comentarios", "language": "idioma",
+    "network": "red", "wireless": "inalámbrica", "connection": "conexión", "battery": "batería", "version": "versión",
+    "release notes": "notas de la versión", "privacy": "privacidad", "security": "seguridad", "notifications": "notificaciones",
+    "message": "mensaje", "messages": "mensajes", "send": "enviar", "reply": "responder", "inbox": "bandeja de entrada",
+    # Vocabulario general
+    "the": "el", "a": "un", "an": "un", "and": "y", "or": "o", "of": "de", "to": "a", "in": "en", "on": "en", "for": "para",
+    "with": "con", "without": "sin", "from": "de", "by": "por", "at": "en", "is": "es", "are": "son", "was": "fue", "be": "ser",
+    "not": "no", "this": "este", "that": "ese", "your": "tu", "you": "tú", "we": "nosotros", "it": "ello", "all": "todo",
+    "before": "antes de", "after": "después de", "now": "ahora", "today": "hoy", "new version": "nueva versión",
+    "please": "por favor", "check": "revisar", "review": "revisión", "report": "informe", "meeting": "reunión",
+    "quick": "rápido", "brown": "marrón", "fox": "zorro", "jumps": "salta", "over": "sobre", "lazy": "perezoso", "dog": "perro",
+    "ready": "listo", "session": "sesión", "expired": "caducó", "minutes": "minutos", "application": "aplicación",
+    "configuration": "configuración", "latest": "última", "fixes": "correcciones", "features": "funciones",
+    "performance": "rendimiento", "improvements": "mejoras", "results": "resultados", "good": "bueno", "health": "estado",
+}
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?|\d+|\s+|.", re.UNICODE)
+
+class DictionaryBackend:
+    # Traducción palabra a palabra (con expresiones de varias palabras) sin red: el resultado
+    # es aproximado pero inmediato. Las palabras desconocidas se dejan como están.
+    # Un TSV propio ("origen<TAB>destino" por línea) amplía o corrige el diccionario incluido.
+    name = 'diccionario'
+    source = 'en'
+
+    def __init__(self, target='es', path=DICTIONARY_PATH, max_phrase_words=DICTIONARY_MAX_PHRASE_WORDS):
+        if target != 'es': raise BackendError(f"el diccionario sin conexión solo traduce al español, no a '{target}'")
+        self.target = target; self.max_phrase_words = max_phrase_words
+        self.entries = dict(BUILTIN_DICTIONARY)
+        if path and os.path.exists(path): self.entries.update(self.load(path))
+        self.lock = threading.Lock()
+        self.calls = 0; self.words = 0; self.known_words = 0
+
+    @staticmethod
+    def load(path):
+        entries = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 2 and parts[0].strip() and not parts[0].startswith("#"): entries[parts[0].strip().lower()] = parts[1].strip()
+        return entries
+
+    @staticmethod
+    def match_case(source, translated):
+        if source.isupper() and len(source) > 1: return translated.upper()
+        if source[:1].isupper(): return translated[:1].upper() + translated[1:]
+        return translated
+
+    def translate_line(self, line):
+        tokens = WORD_PATTERN.findall(line)
+        words = [i for i, token in enumerate(tokens) if token[0].isalpha()]
+        out = []; position = 0; known = 0
+        w = 0
+        while w < len(words):
+            # Expresión más larga primero (solo palabras separadas por espacios)
+            for n in range(min(self.max_phrase_words, len(words) - w), 0, -1):
+                first = words[w]; last = words[w + n - 1]
+                if last - first != 2 * (n - 1) or any(not tokens[k].isspace() for k in range(first + 1, last, 2)): continue
+                translated = self.entries.get(" ".join(tokens[words[w + k]].lower() for k in range(n)))
+                if translated is None: continue
+                out.extend(tokens[position:first]); out.append(self.match_case(tokens[first], translated))
+                position = last + 1; w += n; known += n
+                break
+            else: w += 1
+        out.extend(tokens[position:])
+        with self.lock: self.words += len(words); self.known_words += known
+        return "".join(out)
+
+    def translate(self, text, deadline=None):
+        with self.lock: self.calls += 1
+        return "\n".join(self.translate_line(line) for line in text.split("\n"))
+
+    def close(self): pass
+
+    def stats(self):
+        with self.lock:
+            return {'calls': self.calls, 'words': self.words, 'known_words': self.known_words,
+                    'coverage': round(self.known_words / self.words, 3) if self.words else None, 'entries': len(self.entries)}
+
+# -----------------------------------------------------------------------------
+# REGISTRO DE BACKENDS
+# -----------------------------------------------------------------------------
+BACKENDS = {'google': GoogleWebBackend, 'diccionario': DictionaryBackend}
+BACKEND_LABELS = {'google': "Google Translate (en línea)", 'diccionario': "Diccionario (sin conexión)"}
+
+def create_backend(name=TRANSLATION_BACKEND, target='es', **options):
+    if name not in BACKENDS: raise BackendError(f"backend de traducción desconocido: {name}")
+    return BACKENDS[name](target=target, **options)
@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# --- CONFIGURACIÓN ---
+CACHE_MEMORY_ENTRIES = 5000                      # Entradas máximas en la LRU en memoria
+CACHE_DISK_ENTRIES = 100000                      # Entradas máximas en el almacén SQLite
+CACHE_DISK_PATH = os.path.join(os.path.expanduser("~"), ".traductor_overlay", "translations.sqlite3")
+CACHE_SCHEMA_VERSION = 2                         # 2: las traducciones se guardan por backend
+
+def normalize_text(text):
+    # Normaliza espacios y forma Unicode para que el OCR de la misma frase comparta clave
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+# -----------------------------------------------------------------------------
+# NIVEL 1: LRU EN MEMORIA
+# -----------------------------------------------------------------------------
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0; self.misses = 0; self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries: self.misses += 1; return None
+            self.entries.move_to_end(key); self.hits += 1
+            return self.entries[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value; self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False); self.evictions += 1
+
+    def clear(self):
+        with self.lock: self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+# -----------------------------------------------------------------------------
+# NIVEL 2: ALMACÉN PERSISTENTE EN SQLITE
+# -----------------------------------------------------------------------------
+class DiskCache:
+    def __init__(self, path=CACHE_DISK_PATH, max_entries=CACHE_DISK_ENTRIES):
+        self.path = path; self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0; self.misses = 0; self.evictions = 0
+        if path != ":memory:": os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Una sola conexión compartida entre hilos, serializada con el lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Las tablas de versiones anteriores no sabían qué backend tradujo cada línea: se descartan
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS translations")
+            self.conn.execute(f"PRAGMA user_version={CACHE_SCHEMA_VERSION}")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS translations (
+                             source_text TEXT NOT NULL, backend TEXT NOT NULL, source_lang TEXT NOT NULL, target_lang TEXT NOT NULL,
+                             translated TEXT NOT NULL, last_used REAL NOT NULL,
+                             PRIMARY KEY (source_text, backend, source_lang, target_lang))""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self.conn.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT translated FROM translations WHERE source_text=? AND backend=? AND source_lang=? AND target_lang=?", key).fetchone()
+            if row is None: self.misses += 1; return None
+            self.hits += 1
+            self.conn.execute("UPDATE translations SET last_used=? WHERE source_text=? AND backend=? AND source_lang=? AND target_lang=?", (time.time(), *key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key, value):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", (*key, value, time.time()))
+            count = self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                # Se eliminan las entradas usadas hace más tiempo
+                excess = count - self.max_entries
+                self.conn.execute("DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations ORDER BY last_used LIMIT ?)", (excess,))
+                self.evictions += excess
+            self.conn.commit()
+
+    def clear(self):
+        with self.lock: self.conn.execute("DELETE FROM translations"); self.conn.commit()
+
+    def close(self):
+        with self.lock: self.conn.close()
+
+    def stats(self):
+        with self.lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {'entries': count, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+# -----------------------------------------------------------------------------
+# CACHÉ DE DOS NIVELES
+# -----------------------------------------------------------------------------
+class TranslationCache:
+    def __init__(self, memory_entries=CACHE_MEMORY_ENTRIES, disk_path=CACHE_DISK_PATH, disk_entries=CACHE_DISK_ENTRIES):
+        self.memory = LRUCache(memory_entries)
+        # disk_path=None desactiva el nivel persistente
+        self.disk = DiskCache(disk_path, disk_entries) if disk_path else None
+
+    @staticmethod
+    def make_key(text, namespace):
+        # namespace: (backend, idioma_origen, idioma_destino)
+        return (normalize_text(text), *namespace)
+
+    def get(self, text, namespace):
+        key = self.make_key(text, namespace)
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None: self.memory.put(key, value)  # Promoción al nivel rápido
+        return value
+
+    def put(self, text, namespace, translated):
+        key = self.make_key(text, namespace)
+        self.memory.put(key, translated)
+        if self.disk is not None: self.disk.put(key, translated)
+
+    def close(self):
+        if self.disk is not None: self.disk.close()
+
+    def stats(self):
+        return {'memory': self.memory.stats(), 'disk': self.disk.stats() if self.disk is not None else None}
+
+# -----------------------------------------------------------------------------
+# TRADUCTOR CON CACHÉ
+# -----------------------------------------------------------------------------
+class CachedTranslator:
+    # Envuelve cualquier objeto con translate(text) y atributos source/target (p. ej. GoogleTranslator).
+    # Con translator=None solo ofrece lookup/store y el backend lo aporta quien lo usa (BatchTranslator).
+    # Las traducciones se guardan por backend: dos backends nunca comparten entradas.
+    def __init__(self, translator, cache=None, backend=None, source=None, target=None):
+        self.translator = translator
+        self.cache = cache if cache is not None else TranslationCache()
+        self.namespace = (backend or getattr(translator, 'name', type(translator).__name__),
+                          source or getattr(translator, 'source', 'auto'), target or getattr(translator, 'target', 'es'))
+        self.backend_calls = 0
+        self.lock = threading.Lock()
+
+    def use_backend(self, backend, source):
+        # Se sustituye la tupla entera: quien lee self.namespace nunca ve una mezcla de dos backends
+        self.namespace = (backend, source, self.namespace[2])
+
+    def lookup(self, text, namespace=None):
+        return self.cache.get(text, namespace or self.namespace)
+
+    def store(self, text, translated, namespace=None):
+        # namespace: el del backend que tradujo, capturado al enviar la petición
+        if translated: self.cache.put(text, namespace or self.namespace, translated)
+
+    def count_backend_call(self):
+        # Quien aporta el backend (BatchTranslator) anota aquí sus peticiones para las estadísticas
+        with self.lock: self.backend_calls += 1
+
+    def translate(self, text):
+        cached = self.lookup(text)
+        if cached is not None: return cached
+        self.count_backend_call()
+        translated = self.translator.translate(text)
+        self.store(text, translated)
+        return translated
+
+    def stats(self):
+        stats = self.cache.stats(); stats['backend_calls'] = self.backend_calls
+        return stats
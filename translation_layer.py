@@ -0,0 +1,90 @@
+from PyQt6.QtCore import Qt, QRect, QRectF
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPen, QRegion
+
+# --- CONFIGURACIÓN (mismo aspecto que las antiguas QLabel de traducción) ---
+LABEL_BACKGROUND = QColor(40, 40, 40)
+LABEL_TEXT_COLOR = QColor(0xF0, 0xF0, 0xF0)
+LABEL_BORDER_COLOR = QColor(255, 255, 255, 60)
+LABEL_RADIUS = 3
+LABEL_PADDING_X = 5
+LABEL_PADDING_Y = 3
+LABEL_FONT_FAMILIES = ['Segoe UI', 'Arial', 'sans-serif']
+LABEL_FONT_PIXEL_SIZE = 13
+LABEL_TEXT_FLAGS = Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap
+
+class TranslationItem:
+    __slots__ = ('text', 'rect', 'text_rect')
+
+    def __init__(self, text, rect, text_rect):
+        self.text = text; self.rect = rect; self.text_rect = text_rect
+
+# -----------------------------------------------------------------------------
+# CAPA DE TRADUCCIONES EN MODO RETENIDO
+# -----------------------------------------------------------------------------
+class TranslationLayer:
+    # Todas las traducciones se pintan en el paintEvent del overlay: no se crean widgets
+    # ni se interpretan hojas de estilo. Cada cambio (añadir / mover / cambiar texto /
+    # quitar) solo invalida los rectángulos afectados.
+    def __init__(self, widget):
+        self.widget = widget
+        self.items = {}
+        self.font = QFont(); self.font.setFamilies(LABEL_FONT_FAMILIES)
+        self.font.setPixelSize(LABEL_FONT_PIXEL_SIZE); self.font.setWeight(QFont.Weight.Medium)
+        self.metrics = QFontMetrics(self.font)
+        self.border_pen = QPen(LABEL_BORDER_COLOR, 1)
+        self.adds = 0; self.moves = 0; self.retexts = 0; self.removes = 0; self.unchanged = 0
+
+    def layout(self, text, x, y, max_width):
+        # Ancho máximo fijo (el de la línea original) y alto según el texto envuelto
+        natural = self.metrics.horizontalAdvance(text) + 2 * LABEL_PADDING_X + 2
+        width = max(2 * LABEL_PADDING_X + 12, min(natural, int(max_width)))
+        text_width = width - 2 * LABEL_PADDING_X - 2
+        text_height = self.metrics.boundingRect(QRect(0, 0, text_width, 100000), LABEL_TEXT_FLAGS, text).height()
+        rect = QRect(int(x), int(y), width, text_height + 2 * LABEL_PADDING_Y + 2)
+        return rect, rect.adjusted(LABEL_PADDING_X + 1, LABEL_PADDING_Y + 1, -LABEL_PADDING_X - 1, -LABEL_PADDING_Y - 1)
+
+    def set_item(self, key, text, x, y, max_width):
+        item = self.items.get(key)
+        if item is not None and item.text == text and item.rect.topLeft().x() == int(x) and item.rect.topLeft().y() == int(y):
+            self.unchanged += 1; return
+        rect, text_rect = self.layout(text, x, y, max_width)
+        if item is None: self.adds += 1
+        else:
+            if item.text != text: self.retexts += 1
+            else: self.moves += 1
+            self.widget.update(item.rect.adjusted(-1, -1, 1, 1))
+        self.items[key] = TranslationItem(text, rect, text_rect)
+        self.widget.update(rect.adjusted(-1, -1, 1, 1))
+
+    def remove_item(self, key):
+        item = self.items.pop(key, None)
+        if item is None: return
+        self.removes += 1
+        self.widget.update(item.rect.adjusted(-1, -1, 1, 1))
+
+    def clear(self):
+        if not self.items: return
+        region = QRegion()
+        for item in self.items.values(): region = region.united(item.rect.adjusted(-1, -1, 1, 1))
+        self.removes += len(self.items); self.items.clear()
+        self.widget.update(region)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def paint(self, painter, clip):
+        # clip: región invalidada del paintEvent (QRegion); solo se pintan las etiquetas que la tocan
+        painter.setFont(self.font)
+        for item in self.items.values():
+            if not clip.intersects(item.rect): continue
+            painter.setPen(self.border_pen); painter.setBrush(LABEL_BACKGROUND)
+            painter.drawRoundedRect(QRectF(item.rect).adjusted(0.5, 0.5, -0.5, -0.5), LABEL_RADIUS, LABEL_RADIUS)
+            painter.setPen(LABEL_TEXT_COLOR)
+            painter.drawText(item.text_rect, LABEL_TEXT_FLAGS, item.text)
+
+    def stats(self):
+        return {'items': len(self.items), 'adds': self.adds, 'moves': self.moves, 'retexts': self.retexts,
+                'removes': self.removes, 'unchanged': self.unchanged}